@@ -1,105 +1,24 @@
-import math
 import random
 import os
-
-class Point:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-    
-    def __repr__(self):
-        return f"({self.x:.2f}, {self.y:.2f})"
-
-def distance(p1, p2):
-    return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
-
-def brute_force_closest(points):
-    min_dist = float('inf')
-    pair = None
-    n = len(points)
-    
-    for i in range(n):
-        for j in range(i + 1, n):
-            dist = distance(points[i], points[j])
-            if dist < min_dist:
-                min_dist = dist
-                pair = (points[i], points[j])
-    
-    return min_dist, pair
-
-def strip_closest(strip, d):
-    min_dist = d
-    pair = None
-    strip.sort(key=lambda p: p.y)
-    
-    for i in range(len(strip)):
-        j = i + 1
-        while j < len(strip) and (strip[j].y - strip[i].y) < min_dist:
-            dist = distance(strip[i], strip[j])
-            if dist < min_dist:
-                min_dist = dist
-                pair = (strip[i], strip[j])
-            j += 1
-    
-    return min_dist, pair
-
-def closest_pair_recursive(points_x, points_y):
-    n = len(points_x)
-    
-    if n <= 3:
-        return brute_force_closest(points_x)
-    
-    mid = n // 2
-    mid_point = points_x[mid]
-    
-    points_y_left = [p for p in points_y if p.x <= mid_point.x]
-    points_y_right = [p for p in points_y if p.x > mid_point.x]
-    
-    left_dist, left_pair = closest_pair_recursive(points_x[:mid], points_y_left)
-    right_dist, right_pair = closest_pair_recursive(points_x[mid:], points_y_right)
-    
-    if left_dist < right_dist:
-        min_dist = left_dist
-        min_pair = left_pair
-    else:
-        min_dist = right_dist
-        min_pair = right_pair
-    
-    strip = [p for p in points_y if abs(p.x - mid_point.x) < min_dist]
-    
-    if strip:
-        strip_dist, strip_pair = strip_closest(strip, min_dist)
-        if strip_dist < min_dist:
-            min_dist = strip_dist
-            min_pair = strip_pair
-    
-    return min_dist, min_pair
-
-def closest_pair(points):
-    points_x = sorted(points, key=lambda p: p.x)
-    points_y = sorted(points, key=lambda p: p.y)
-    return closest_pair_recursive(points_x, points_y)
-
-
-def karatsuba_multiply(x, y):
-    if x < 10 or y < 10:
-        return x * y
-    
-    n = max(len(str(x)), len(str(y)))
-    half = n // 2
-    power = 10 ** half
-    
-    high1 = x // power
-    low1 = x % power
-    high2 = y // power
-    low2 = y % power
-    
-    z0 = karatsuba_multiply(low1, low2)
-    z1 = karatsuba_multiply(low1 + high1, low2 + high2)
-    z2 = karatsuba_multiply(high1, high2)
-    
-    return z2 * (10 ** (2 * half)) + (z1 - z2 - z0) * power + z0
-
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from dnc.point import Point
+from dnc.closest_pair import closest_pair
+from dnc.multiply import karatsuba_multiply
+from dnc.closest_pair_grid import closest_pair_grid
+from dnc.decimal_io import int_to_str, str_to_int
+from dnc.csv_io import load_points_csv
+from dnc.binary_io import (write_points, write_integers, read_points, read_integers,
+                           is_binary_dataset, convert_tree)
+
+CLOSEST_PAIR_SIZES = [100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000]
+MULTIPLICATION_SIZES = [100, 150, 200, 300, 400, 500, 750, 1000, 1500, 2000]
+LARGE_MULTIPLICATION_SIZES = [10000, 100000, 1000000, 10000000]
+UNBALANCED_MULTIPLICATION_SIZES = [(1000, 100), (10000, 100), (100000, 1000), (1000000, 10000)]
 
 def generate_closest_pair_data(n, max_coord=10000.0):
     points = []
@@ -109,9 +28,14 @@ def generate_closest_pair_data(n, max_coord=10000.0):
         points.append(Point(x, y))
     return points
 
-def generate_multiplication_data(digits):
-    num1 = random.randint(10**(digits-1), 10**digits - 1)
-    num2 = random.randint(10**(digits-1), 10**digits - 1)
+def generate_multiplication_data(digits, digits2=None):
+    if digits2 is None:
+        digits2 = digits
+    # each power of ten is built once: at 10M digits one costs ~10 s
+    low1 = 10**(digits-1)
+    low2 = low1 if digits2 == digits else 10**(digits2-1)
+    num1 = random.randint(low1, 10 * low1 - 1)
+    num2 = random.randint(low2, 10 * low2 - 1)
     return num1, num2
 
 def save_closest_pair_to_file(filename, points):
@@ -121,46 +45,76 @@ def save_closest_pair_to_file(filename, points):
 
 def save_multiplication_to_file(filename, num1, num2):
     with open(filename, 'w') as f:
-        f.write(f"{num1}\n{num2}\n")
+        f.write(f"{int_to_str(num1)}\n{int_to_str(num2)}\n")
+
+def save_closest_pair_binary(filename, points):
+    write_points(filename, points)
+
+def save_multiplication_binary(filename, num1, num2):
+    write_integers(filename, [num1, num2])
 
 def load_closest_pair_from_file(filename):
-    points = []
-    with open(filename, 'r') as f:
-        for line in f:
-            x, y = map(float, line.strip().split(','))
-            points.append(Point(x, y))
-    return points
+    if is_binary_dataset(filename):
+        return read_points(filename, Point)
+    return load_points_csv(filename, Point)
 
 def load_multiplication_from_file(filename):
+    if is_binary_dataset(filename):
+        num1, num2 = read_integers(filename)[:2]
+        return num1, num2
     with open(filename, 'r') as f:
         lines = f.readlines()
-        num1 = int(lines[0].strip())
-        num2 = int(lines[1].strip())
+        num1 = str_to_int(lines[0])
+        num2 = str_to_int(lines[1])
     return num1, num2
 
 
-def generate_all_datasets():
+def generate_all_datasets(large=False, unbalanced=False, seed=None, distribution='uniform', workers=1):
     os.makedirs('datasets/closest_pair', exist_ok=True)
     os.makedirs('datasets/multiplication', exist_ok=True)
     
     print("generating datasets...")
-    
-    closest_pair_sizes = [100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000]
-    
-    for i, size in enumerate(closest_pair_sizes, 1):
-        points = generate_closest_pair_data(size)
-        filename = f'datasets/closest_pair/input_{i:02d}_size{size}.txt'
-        save_closest_pair_to_file(filename, points)
-        print(f"created: {filename}")
-    
-    multiplication_sizes = [100, 150, 200, 300, 400, 500, 750, 1000, 1500, 2000]
-    
-    for i, size in enumerate(multiplication_sizes, 1):
+    if seed is not None:
+        random.seed(seed)
+    
+    if seed is None and distribution == 'uniform':
+        for i, size in enumerate(CLOSEST_PAIR_SIZES, 1):
+            points = generate_closest_pair_data(size)
+            filename = f'datasets/closest_pair/input_{i:02d}_size{size}.txt'
+            save_closest_pair_to_file(filename, points)
+            print(f"created: {filename}")
+    else:
+        from dnc.generate import generate_files
+        jobs = []
+        for i, size in enumerate(CLOSEST_PAIR_SIZES, 1):
+            filename = f'datasets/closest_pair/input_{i:02d}_size{size}.txt'
+            jobs.append((filename, size, distribution, None if seed is None else seed + i))
+        generate_files(jobs, workers)
+        for job in jobs:
+            print(f"created: {job[0]}")
+    
+    for i, size in enumerate(MULTIPLICATION_SIZES, 1):
         num1, num2 = generate_multiplication_data(size)
         filename = f'datasets/multiplication/input_{i:02d}_digits{size}.txt'
         save_multiplication_to_file(filename, num1, num2)
         print(f"created: {filename}")
     
+    if large:
+        first = len(MULTIPLICATION_SIZES) + 1
+        for i, size in enumerate(LARGE_MULTIPLICATION_SIZES, first):
+            num1, num2 = generate_multiplication_data(size)
+            filename = f'datasets/multiplication/input_{i:02d}_digits{size}.txt'
+            save_multiplication_to_file(filename, num1, num2)
+            print(f"created: {filename}")
+    
+    if unbalanced:
+        os.makedirs('datasets/multiplication_unbalanced', exist_ok=True)
+        for i, (long_digits, short_digits) in enumerate(UNBALANCED_MULTIPLICATION_SIZES, 1):
+            num1, num2 = generate_multiplication_data(long_digits, short_digits)
+            filename = f'datasets/multiplication_unbalanced/input_{i:02d}_digits{long_digits}x{short_digits}.txt'
+            save_multiplication_to_file(filename, num1, num2)
+            print(f"created: {filename}")
+    
     print("\ndone!")
 
 def test_closest_pair(filename):
@@ -185,30 +139,108 @@ def test_multiplication(filename):
     print(f"{'='*60}")
     
     num1, num2 = load_multiplication_from_file(filename)
-    print(f"num1 digits: {len(str(num1))}")
-    print(f"num2 digits: {len(str(num2))}")
-    print(f"num1: {str(num1)[:50]}..." if len(str(num1)) > 50 else f"num1: {num1}")
-    print(f"num2: {str(num2)[:50]}..." if len(str(num2)) > 50 else f"num2: {num2}")
+    s1 = int_to_str(num1)
+    s2 = int_to_str(num2)
+    print(f"num1 digits: {len(s1)}")
+    print(f"num2 digits: {len(s2)}")
+    print(f"num1: {s1[:50]}..." if len(s1) > 50 else f"num1: {s1}")
+    print(f"num2: {s2[:50]}..." if len(s2) > 50 else f"num2: {s2}")
     
     result = karatsuba_multiply(num1, num2)
     
     print(f"\nResult:")
-    result_str = str(result)
+    result_str = int_to_str(result)
     if len(result_str) > 100:
         print(f"{result_str[:50]}...{result_str[-50:]}")
         print(f"total digits: {len(result_str)}")
     else:
-        print(result)
+        print(result_str)
     
     expected = num1 * num2
     print(f"\nverification: {'PASS' if result == expected else 'FAIL'}")
 
+def run_closest_pair_crossover_benchmark(sizes=CLOSEST_PAIR_SIZES, repeats=5):
+    print(f"\n{'='*60}")
+    print("Closest Pair Engines: divide & conquer vs grid")
+    print(f"{'='*60}")
+    print(f"{'Points':<10} {'dc (ms)':<12} {'grid (ms)':<12} {'faster':<8}")
+    print("-"*60)
+    
+    results = []
+    for size in sizes:
+        points = generate_closest_pair_data(size)
+        
+        timings = {}
+        for name, solve in (('dc', closest_pair), ('grid', closest_pair_grid)):
+            runs = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                min_dist, pair = solve(points)
+                runs.append((time.perf_counter() - start) * 1000)
+            runs.sort()
+            timings[name] = (runs[len(runs) // 2], min_dist)
+        
+        if timings['dc'][1] != timings['grid'][1]:
+            raise AssertionError(f"engines disagree on {size} points")
+        
+        faster = 'grid' if timings['grid'][0] < timings['dc'][0] else 'dc'
+        print(f"{size:<10} {timings['dc'][0]:<12.2f} {timings['grid'][0]:<12.2f} {faster:<8}")
+        results.append({'points': size, 'dc': timings['dc'][0], 'grid': timings['grid'][0]})
+    
+    # crossover = smallest size from which grid stays ahead
+    crossover = None
+    for r in reversed(results):
+        if r['grid'] >= r['dc']:
+            break
+        crossover = r['points']
+    
+    if crossover is None:
+        print("\nno crossover: dc is faster at the largest size")
+    else:
+        print(f"\ncrossover: grid is faster from {crossover} points")
+    
+    return results, crossover
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--crossover', action='store_true')
+    parser.add_argument('--large', action='store_true')
+    parser.add_argument('--unbalanced', action='store_true')
+    parser.add_argument('--convert', metavar='FOLDER', nargs='?', const='datasets')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--distribution', default='uniform',
+                        choices=['uniform', 'clustered', 'gridded', 'duplicates', 'collinear'])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--generate', metavar='FILE')
+    parser.add_argument('--points', type=int, default=1000000)
+    args = parser.parse_args()
+    
+    if args.generate:
+        from dnc.generate import write_points_file
+        start = time.perf_counter()
+        seed = write_points_file(args.generate, args.points, args.distribution, args.seed,
+                                 workers=args.workers)
+        print(f"created: {args.generate} ({args.points} {args.distribution} points, seed {seed}) "
+              f"in {time.perf_counter() - start:.2f} s")
+        sys.exit(0)
+    
+    if args.convert:
+        written, skipped = convert_tree(args.convert)
+        for path in written:
+            print(f"created: {path}")
+        for path, reason in skipped:
+            print(f"skipped: {path} ({reason})")
+        sys.exit(0)
+    
+    if args.crossover:
+        run_closest_pair_crossover_benchmark()
+        sys.exit(0)
+    
     print("Divide and Conquer Algorithms")
     print("=" * 60)
     
     print("\ngenerating datasets...")
-    generate_all_datasets()
+    generate_all_datasets(args.large, args.unbalanced, args.seed, args.distribution, args.workers)
     
     print("\ntesting algorithms...")
     
@@ -1,105 +1,38 @@
-import math
 import os
+import sys
 import time
+import random
+import argparse
+import tracemalloc
+from functools import partial
 
-class Point:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-    
-    def __repr__(self):
-        return f"({self.x:.2f}, {self.y:.2f})"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-def distance(p1, p2):
-    return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
-
-def brute_force_closest(points):
-    min_dist = float('inf')
-    pair = None
-    n = len(points)
-    
-    for i in range(n):
-        for j in range(i + 1, n):
-            dist = distance(points[i], points[j])
-            if dist < min_dist:
-                min_dist = dist
-                pair = (points[i], points[j])
-    
-    return min_dist, pair
-
-def strip_closest(strip, d):
-    min_dist = d
-    pair = None
-    strip.sort(key=lambda p: p.y)
-    
-    for i in range(len(strip)):
-        j = i + 1
-        while j < len(strip) and (strip[j].y - strip[i].y) < min_dist:
-            dist = distance(strip[i], strip[j])
-            if dist < min_dist:
-                min_dist = dist
-                pair = (strip[i], strip[j])
-            j += 1
-    
-    return min_dist, pair
-
-def closest_pair_recursive(points_x, points_y):
-    n = len(points_x)
-    
-    if n <= 3:
-        return brute_force_closest(points_x)
-    
-    mid = n // 2
-    mid_point = points_x[mid]
-    
-    points_y_left = [p for p in points_y if p.x <= mid_point.x]
-    points_y_right = [p for p in points_y if p.x > mid_point.x]
-    
-    left_dist, left_pair = closest_pair_recursive(points_x[:mid], points_y_left)
-    right_dist, right_pair = closest_pair_recursive(points_x[mid:], points_y_right)
-    
-    if left_dist < right_dist:
-        min_dist = left_dist
-        min_pair = left_pair
-    else:
-        min_dist = right_dist
-        min_pair = right_pair
-    
-    strip = [p for p in points_y if abs(p.x - mid_point.x) < min_dist]
-    
-    if strip:
-        strip_dist, strip_pair = strip_closest(strip, min_dist)
-        if strip_dist < min_dist:
-            min_dist = strip_dist
-            min_pair = strip_pair
-    
-    return min_dist, min_pair
-
-def closest_pair(points):
-    points_x = sorted(points, key=lambda p: p.x)
-    points_y = sorted(points, key=lambda p: p.y)
-    return closest_pair_recursive(points_x, points_y)
-
-def karatsuba_multiply(x, y):
-    if x < 10 or y < 10:
-        return x * y
-    
-    n = max(len(str(x)), len(str(y)))
-    half = n // 2
-    power = 10 ** half
-    
-    high1 = x // power
-    low1 = x % power
-    high2 = y // power
-    low2 = y % power
-    
-    z0 = karatsuba_multiply(low1, low2)
-    z1 = karatsuba_multiply(low1 + high1, low2 + high2)
-    z2 = karatsuba_multiply(high1, high2)
-    
-    return z2 * (10 ** (2 * half)) + (z1 - z2 - z0) * power + z0
+from dnc.point import Point
+from dnc.closest_pair import closest_pair
+from dnc.closest_pair_indexed import closest_pair_indexed, closest_pair_squared
+from dnc.closest_pair_grid import closest_pair_grid
+from dnc.closest_pair_parallel import closest_pair_parallel
+from dnc.closest_pair_queries import k_closest_pairs, all_nearest_neighbors
+from dnc.closest_pair_dynamic import DynamicClosestPair
+from dnc.closest_pair_external import closest_pair_external
+from dnc.multiply import (karatsuba_multiply, karatsuba_binary, toom3_multiply, hybrid_multiply,
+                          unbalanced_multiply, get_thresholds, choose_method)
+from dnc.multiply_parallel import parallel_karatsuba, PARALLEL_MIN_BITS
+from dnc.decimal_io import str_to_int, digit_count
+from dnc.csv_io import read_points_csv, load_points_csv
+from dnc.binary_io import read_points, read_integers, is_binary_dataset
+from dnc.benchmark import run_trials, summarize, fit_growth, environment, write_results
+from dnc.trace import Tracer, DistanceCounter
+from dnc.step_log import StepLog, ClosestPairSteps, KaratsubaSteps
+from dnc import trace_baseline
 
 def load_closest_pair_from_file(filename):
+    if is_binary_dataset(filename):
+        return read_points(filename, Point)
+    return load_points_csv(filename, Point)
+
+def load_closest_pair_per_line(filename):
     points = []
     with open(filename, 'r') as f:
         for line in f:
@@ -108,20 +41,65 @@ def load_closest_pair_from_file(filename):
     return points
 
 def load_multiplication_from_file(filename):
+    if is_binary_dataset(filename):
+        num1, num2 = read_integers(filename)[:2]
+        return num1, num2
     with open(filename, 'r') as f:
         lines = f.readlines()
-        num1 = int(lines[0].strip())
-        num2 = int(lines[1].strip())
+        num1 = str_to_int(lines[0])
+        num2 = str_to_int(lines[1])
     return num1, num2
 
+def list_datasets(folder):
+    # a converted binary file replaces the text file it was made from,
+    # unless the text file has been regenerated since
+    files = {}
+    for f in sorted(os.listdir(folder)):
+        stem, ext = os.path.splitext(f)
+        if ext == '.txt' or is_binary_dataset(f):
+            files.setdefault(stem, []).append(f)
+    
+    mtime = lambda f: os.path.getmtime(os.path.join(folder, f))
+    picked = []
+    for stem in sorted(files):
+        text = [f for f in files[stem] if f.endswith('.txt')]
+        binary = [f for f in files[stem] if is_binary_dataset(f)]
+        if binary and (not text or mtime(binary[0]) >= mtime(text[0])):
+            picked.append(binary[0])
+        else:
+            picked.append(text[0])
+    return picked
+
+
+CLOSEST_PAIR_ENGINES = ['dc', 'indexed', 'squared', 'grid', 'parallel', 'numpy']
+
+def get_closest_pair_engine(engine):
+    if engine == 'dc':
+        return closest_pair
+    if engine == 'indexed':
+        return closest_pair_indexed
+    if engine == 'squared':
+        return closest_pair_squared
+    if engine == 'grid':
+        return closest_pair_grid
+    if engine == 'parallel':
+        return closest_pair_parallel
+    if engine == 'numpy':
+        from dnc.closest_pair_numpy import closest_pair_numpy
+        return closest_pair_numpy
+    raise ValueError(f"unknown closest pair engine: {engine}")
+
 
-def run_all_closest_pair_tests():
+def run_all_closest_pair_tests(engine='dc'):
+    solve = get_closest_pair_engine(engine)
+    
     print("\n" + "="*70)
     print("CLOSEST PAIR OF POINTS - TESTING ALL DATASETS")
+    print(f"engine: {engine}")
     print("="*70)
     
     folder = 'datasets/closest_pair'
-    files = sorted([f for f in os.listdir(folder) if f.endswith('.txt')])
+    files = list_datasets(folder)
     
     results = []
     
@@ -133,7 +111,7 @@ def run_all_closest_pair_tests():
         num_points = len(points)
         
         start = time.time()
-        min_dist, pair = closest_pair(points)
+        min_dist, pair = solve(points)
         end = time.time()
         
         exec_time = (end - start) * 1000
@@ -161,13 +139,297 @@ def run_all_closest_pair_tests():
     return results
 
 
-def run_all_multiplication_tests():
+def count_distance_evaluations(points):
+    counter = DistanceCounter()
+    closest_pair(points, counter)
+    return counter.evals
+
+
+def run_distance_count_comparison(folder='datasets/closest_pair'):
+    print("\n" + "="*70)
+    print("CLOSEST PAIR - DISTANCE EVALUATIONS PER VARIANT")
+    print("="*70)
+    
+    files = list_datasets(folder)
+    
+    results = []
+    
+    for filename in files:
+        points = load_closest_pair_from_file(os.path.join(folder, filename))
+        
+        indexed_counts = {}
+        squared_counts = {}
+        closest_pair_indexed(points, counts=indexed_counts)
+        closest_pair_squared(points, counts=squared_counts)
+        
+        results.append({
+            'file': filename,
+            'points': len(points),
+            'dc': count_distance_evaluations(points),
+            'indexed': indexed_counts['distance_evals'],
+            'squared': squared_counts['distance_evals']
+        })
+    
+    print(f"{'File':<30} {'Points':<8} {'dc':<10} {'indexed':<10} {'squared':<10} {'Saved':<8}")
+    print("-"*70)
+    for r in results:
+        saved = 100.0 * (1 - r['squared'] / r['dc'])
+        print(f"{r['file']:<30} {r['points']:<8} {r['dc']:<10} {r['indexed']:<10} {r['squared']:<10} {saved:.1f}%")
+    
+    return results
+
+
+def canonical_pair(pair):
+    if pair is None:
+        return None
+    return tuple(sorted((p.x, p.y) for p in pair))
+
+
+def run_parallel_speedup_benchmark(filepath, worker_counts=(1, 2, 4, 8)):
+    print("\n" + "="*70)
+    print("CLOSEST PAIR - PARALLEL SPEEDUP")
+    print(f"File: {filepath}")
+    print("="*70)
+    
+    points = load_closest_pair_from_file(filepath)
+    
+    start = time.perf_counter()
+    serial_dist, serial_pair = closest_pair(points)
+    serial_time = (time.perf_counter() - start) * 1000
+    
+    print(f"{'Workers':<10} {'Time (ms)':<12} {'Speedup':<10} {'Same dist':<10} {'Same pair':<10}")
+    print("-"*70)
+    print(f"{'serial':<10} {serial_time:<12.2f} {1.0:<10.2f} {'-':<10} {'-':<10}")
+    
+    # workers may hand back copies of the points, so pairs are compared by
+    # coordinates in a fixed order. with tied distances a different pair
+    # is still a correct answer, hence the two columns
+    serial_key = canonical_pair(serial_pair)
+    
+    results = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        min_dist, pair = closest_pair_parallel(points, workers=workers)
+        exec_time = (time.perf_counter() - start) * 1000
+        
+        same_dist = min_dist == serial_dist
+        same_pair = canonical_pair(pair) == serial_key
+        speedup = serial_time / exec_time
+        print(f"{workers:<10} {exec_time:<12.2f} {speedup:<10.2f} {str(same_dist):<10} {str(same_pair):<10}")
+        
+        results.append({
+            'workers': workers,
+            'time': exec_time,
+            'speedup': speedup,
+            'same_dist': same_dist,
+            'same_pair': same_pair
+        })
+    
+    return results
+
+
+def test_closest_pair_queries(filepath, k=5):
+    print("\n" + "="*70)
+    print("CLOSEST PAIR - K CLOSEST PAIRS & NEAREST NEIGHBOURS")
+    print(f"File: {filepath}")
+    print("="*70)
+    
+    points = load_closest_pair_from_file(filepath)
+    
+    start = time.perf_counter()
+    pairs = k_closest_pairs(points, k)
+    pairs_time = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    neighbours = all_nearest_neighbors(points)
+    nn_time = (time.perf_counter() - start) * 1000
+    
+    print(f"\n{len(pairs)} closest pairs ({pairs_time:.2f} ms):")
+    for dist, (p, q) in pairs:
+        print(f"  {dist:.6f}  {p} <-> {q}")
+    
+    dists = [d for d, _ in neighbours]
+    print(f"\nnearest neighbours ({nn_time:.2f} ms):")
+    print(f"  min: {min(dists):.6f}")
+    print(f"  mean: {sum(dists) / len(dists):.6f}")
+    print(f"  max: {max(dists):.6f}")
+    
+    return pairs, neighbours
+
+
+def run_dynamic_closest_pair_benchmark(filepath, updates=200):
+    print("\n" + "="*70)
+    print("CLOSEST PAIR - DYNAMIC UPDATES VS FULL RECOMPUTATION")
+    print(f"File: {filepath}")
+    print("="*70)
+    
+    points = load_closest_pair_from_file(filepath)
+    current = list(points)
+    
+    start = time.perf_counter()
+    dynamic = DynamicClosestPair(points)
+    build_time = (time.perf_counter() - start) * 1000
+    
+    xs = [p.x for p in points]
+    ys = [p.y for p in points]
+    lo_x, hi_x, lo_y, hi_y = min(xs), max(xs), min(ys), max(ys)
+    
+    dynamic_time = 0.0
+    full_time = 0.0
+    mismatches = 0
+    
+    for step in range(updates):
+        if step % 2 == 0:
+            point = Point(random.uniform(lo_x, hi_x), random.uniform(lo_y, hi_y))
+            current.append(point)
+            start = time.perf_counter()
+            dynamic.insert(point)
+            dyn_dist, _ = dynamic.current_closest()
+            dynamic_time += time.perf_counter() - start
+        else:
+            point = current.pop(random.randrange(len(current)))
+            start = time.perf_counter()
+            dynamic.delete(point)
+            dyn_dist, _ = dynamic.current_closest()
+            dynamic_time += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        full_dist, _ = closest_pair(current)
+        full_time += time.perf_counter() - start
+        
+        if dyn_dist != full_dist:
+            mismatches += 1
+    
+    dynamic_avg = dynamic_time * 1000 / updates
+    full_avg = full_time * 1000 / updates
+    
+    print(f"  Points: {len(points)}")
+    print(f"  Updates: {updates} (alternating insert / delete)")
+    print(f"  Initial build: {build_time:.2f} ms")
+    print(f"  Dynamic per update: {dynamic_avg:.4f} ms")
+    print(f"  Full recompute per update: {full_avg:.4f} ms")
+    print(f"  Speedup: {full_avg / dynamic_avg:.1f}x")
+    print(f"  Mismatches: {mismatches}")
+    
+    return {
+        'points': len(points),
+        'updates': updates,
+        'build': build_time,
+        'dynamic': dynamic_avg,
+        'full': full_avg,
+        'mismatches': mismatches
+    }
+
+
+def test_external_closest_pair(filepath, budget_mb=64, strict=False):
+    print("\n" + "="*70)
+    print("CLOSEST PAIR - OUT-OF-CORE")
+    print(f"File: {filepath}")
+    print(f"Memory budget: {budget_mb} MB")
+    print("="*70)
+    
+    stats = {}
+    start = time.perf_counter()
+    min_dist, pair = closest_pair_external(filepath, int(budget_mb * 1024 * 1024),
+                                           point_type=Point, stats=stats, strict=strict)
+    exec_time = (time.perf_counter() - start) * 1000
+    
+    print(f"  Points: {stats['points']}")
+    print(f"  Sorted runs: {stats['runs']} of up to {stats['run_points']} points")
+    print(f"  Min Distance: {min_dist:.6f}")
+    print(f"  Closest Pair: {pair[0]} <-> {pair[1]}")
+    print(f"  Time: {exec_time:.2f} ms")
+    print(f"  Peak RSS: {stats['peak_rss_kb'] / 1024:.1f} MB")
+    if stats['rss_growth_kb'] is None:
+        print("  RSS growth: not measurable on this platform")
+    else:
+        print(f"  RSS growth during the run: {stats['rss_growth_kb'] / 1024:.1f} MB")
+    if stats['over_budget']:
+        print(f"  WARNING: the run grew RSS by more than the {budget_mb} MB budget")
+    
+    return min_dist, pair, stats
+
+
+class DictPoint:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def report_point_memory(filepath):
+    print("\n" + "="*70)
+    print("POINT MEMORY - __dict__ vs __slots__")
+    print(f"File: {filepath}")
+    print("="*70)
+    
+    with open(filepath, 'r') as f:
+        coords = [tuple(map(float, line.strip().split(','))) for line in f if line.strip()]
+    
+    usage = {}
+    for name, cls in (('dict', DictPoint), ('slots', Point)):
+        tracemalloc.start()
+        points = [cls(x, y) for x, y in coords]
+        usage[name] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del points
+    
+    n = len(coords)
+    print(f"  Points: {n}")
+    for name in ('dict', 'slots'):
+        print(f"  {name:<6} {usage[name] / 1024:10.1f} KB  {usage[name] / n:6.1f} bytes/point  "
+              f"{usage[name] / n * 10_000_000 / 1024**3:6.2f} GB per 10M points")
+    print(f"  Saved: {100 * (1 - usage['slots'] / usage['dict']):.1f}%")
+    
+    return usage
+
+
+MULTIPLICATION_ENGINES = ['karatsuba', 'binary', 'toom3', 'ntt', 'hybrid', 'unbalanced']
+# the library cutoffs (KARATSUBA_THRESHOLD_BITS, NTT_THRESHOLD_BITS) hand
+# anything below ~65k bits / ~4M bits straight to native x*y, which is all
+# of the shipped datasets (2000 digits ~ 6.6k bits). an engine picked by
+# name recurses from this size instead, so its own algorithm is what gets
+# timed; --mult-threshold overrides it
+ENGINE_THRESHOLD_BITS = {'binary': 1024, 'toom3': 1024, 'ntt': 1024, 'unbalanced': 1024}
+
+def engine_threshold(engine, threshold=None):
+    if threshold is not None and engine in ENGINE_THRESHOLD_BITS:
+        return threshold
+    return ENGINE_THRESHOLD_BITS.get(engine)
+
+def get_multiplication_engine(engine, threshold=None):
+    threshold = engine_threshold(engine, threshold)
+    if engine == 'karatsuba':
+        return karatsuba_multiply
+    if engine == 'binary':
+        return partial(karatsuba_binary, threshold=threshold)
+    if engine == 'toom3':
+        return partial(toom3_multiply, threshold=threshold)
+    if engine == 'ntt':
+        from dnc.ntt import ntt_multiply
+        return partial(ntt_multiply, threshold=threshold)
+    if engine == 'hybrid':
+        return hybrid_multiply
+    if engine == 'unbalanced':
+        return partial(unbalanced_multiply, mul=partial(karatsuba_binary, threshold=threshold))
+    raise ValueError(f"unknown multiplication engine: {engine}")
+
+
+def describe_engine(engine, threshold=None):
+    cutoff = engine_threshold(engine, threshold)
+    if cutoff is None:
+        return engine
+    return f"{engine} (native below {cutoff} bits)"
+
+
+def run_all_multiplication_tests(engine='karatsuba', folder='datasets/multiplication', threshold=None):
+    multiply = get_multiplication_engine(engine, threshold)
+    
     print("\n" + "="*70)
     print("KARATSUBA MULTIPLICATION - TESTING ALL DATASETS")
+    print(f"engine: {describe_engine(engine, threshold)}")
     print("="*70)
     
-    folder = 'datasets/multiplication'
-    files = sorted([f for f in os.listdir(folder) if f.endswith('.txt')])
+    files = list_datasets(folder)
     
     results = []
     
@@ -176,21 +438,22 @@ def run_all_multiplication_tests():
         print(f"\nTesting: {filename}")
         
         num1, num2 = load_multiplication_from_file(filepath)
-        digits1 = len(str(num1))
-        digits2 = len(str(num2))
+        digits1 = digit_count(num1)
+        digits2 = digit_count(num2)
         
         start = time.time()
-        result = karatsuba_multiply(num1, num2)
+        result = multiply(num1, num2)
         end = time.time()
         
         exec_time = (end - start) * 1000
         
         expected = num1 * num2
         verified = result == expected
+        result_digits = digit_count(result)
         
         print(f"  Num1 Digits: {digits1}")
         print(f"  Num2 Digits: {digits2}")
-        print(f"  Result Digits: {len(str(result))}")
+        print(f"  Result Digits: {result_digits}")
         print(f"  Verified: {verified}")
         print(f"  Time: {exec_time:.2f} ms")
         
@@ -198,7 +461,7 @@ def run_all_multiplication_tests():
             'file': filename,
             'digits1': digits1,
             'digits2': digits2,
-            'result_digits': len(str(result)),
+            'result_digits': result_digits,
             'verified': verified,
             'time': exec_time
         })
@@ -214,14 +477,373 @@ def run_all_multiplication_tests():
     return results
 
 
+def run_multiplication_timing_table(folder='datasets/multiplication'):
+    thresholds = get_thresholds()
+    
+    print("\n" + "="*70)
+    print("MULTIPLICATION - TIMINGS PER SIZE")
+    print(f"hybrid: karatsuba from: {thresholds['karatsuba']} bits, toom-3 from: {thresholds['toom3']} bits")
+    print(f"binary, toom3, unbalanced: native below {ENGINE_THRESHOLD_BITS['binary']} bits")
+    print("="*70)
+    
+    files = list_datasets(folder)
+    methods = [
+        ('native', lambda a, b: a * b),
+        ('decimal', karatsuba_multiply),
+        ('binary', get_multiplication_engine('binary')),
+        ('toom3', get_multiplication_engine('toom3')),
+        ('hybrid', hybrid_multiply),
+        ('unbalanced', get_multiplication_engine('unbalanced'))
+    ]
+    
+    print(f"{'Digits':<8} " + " ".join(f"{name + ' (ms)':<13}" for name, _ in methods) + " Picked")
+    print("-"*90)
+    
+    results = []
+    for filename in files:
+        num1, num2 = load_multiplication_from_file(os.path.join(folder, filename))
+        expected = num1 * num2
+        
+        row = {'file': filename, 'digits': digit_count(num1)}
+        for name, multiply in methods:
+            start = time.perf_counter()
+            result = multiply(num1, num2)
+            row[name] = (time.perf_counter() - start) * 1000
+            if result != expected:
+                raise AssertionError(f"{name} gave a wrong product for {filename}")
+        row['picked'] = choose_method(max(num1.bit_length(), num2.bit_length()), thresholds)
+        
+        print(f"{row['digits']:<8} " + " ".join(f"{row[name]:<13.3f}" for name, _ in methods) + f" {row['picked']}")
+        results.append(row)
+    
+    return results
+
+
+def run_parallel_multiplication_benchmark(filepath, worker_counts=(1, 2, 4, 8), levels=None,
+                                          min_bits=PARALLEL_MIN_BITS):
+    print("\n" + "="*70)
+    print("KARATSUBA MULTIPLICATION - PARALLEL SPEEDUP")
+    print(f"File: {filepath}")
+    print(f"split across processes above {min_bits} bits")
+    print("="*70)
+    
+    num1, num2 = load_multiplication_from_file(filepath)
+    
+    start = time.perf_counter()
+    expected = karatsuba_binary(num1, num2)
+    serial_time = (time.perf_counter() - start) * 1000
+    
+    print(f"{'Workers':<10} {'Time (ms)':<12} {'Speedup':<10} {'Identical':<10}")
+    print("-"*70)
+    print(f"{'serial':<10} {serial_time:<12.2f} {1.0:<10.2f} {'-':<10}")
+    
+    results = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        result = parallel_karatsuba(num1, num2, workers=workers, levels=levels, min_bits=min_bits)
+        exec_time = (time.perf_counter() - start) * 1000
+        
+        identical = result == expected
+        speedup = serial_time / exec_time
+        print(f"{workers:<10} {exec_time:<12.2f} {speedup:<10.2f} {str(identical):<10}")
+        
+        results.append({
+            'workers': workers,
+            'time': exec_time,
+            'speedup': speedup,
+            'identical': identical
+        })
+    
+    return results
+
+
+def run_unbalanced_multiplication_benchmark(folder='datasets/multiplication_unbalanced', threshold=None,
+                                            repeats=5, warmup=1):
+    # chunking against balanced karatsuba on the same operands, both
+    # recursing down to the same cutoff, so only the splitting differs
+    threshold = engine_threshold('unbalanced', threshold)
+    balanced = partial(karatsuba_binary, threshold=threshold)
+    chunked = partial(unbalanced_multiply, mul=balanced)
+    
+    print("\n" + "="*70)
+    print("MULTIPLICATION - UNBALANCED OPERANDS")
+    print(f"karatsuba native below {threshold} bits in both columns")
+    print("="*70)
+    print(f"{'Digits':<18} {'native (ms)':<13} {'balanced (ms)':<15} {'chunked (ms)':<14} {'Speedup':<9} {'Verified':<8}")
+    print("-"*80)
+    
+    results = []
+    for filename in list_datasets(folder):
+        num1, num2 = load_multiplication_from_file(os.path.join(folder, filename))
+        digits = f"{digit_count(num1)}x{digit_count(num2)}"
+        
+        times = {}
+        for name, fn in [('native', lambda a, b: a * b), ('balanced', balanced), ('chunked', chunked)]:
+            times[name] = summarize(run_trials(fn, (num1, num2), repeats, warmup))['median_ns'] / 1e6
+        verified = chunked(num1, num2) == num1 * num2 == balanced(num1, num2)
+        speedup = times['balanced'] / times['chunked']
+        
+        print(f"{digits:<18} {times['native']:<13.3f} {times['balanced']:<15.3f} {times['chunked']:<14.3f} "
+              f"{speedup:<9.2f} {str(verified):<8}")
+        results.append(dict(times, file=filename, digits=digits, speedup=speedup, verified=verified))
+    
+    return results
+
+
+def run_parse_benchmark(filepath, repeats=3):
+    print("\n" + "="*70)
+    print("CLOSEST PAIR - TEXT LOADER THROUGHPUT")
+    print(f"File: {filepath}")
+    print("="*70)
+    
+    size_mb = os.path.getsize(filepath) / (1024 * 1024)
+    loaders = [
+        ('per line', load_closest_pair_per_line),
+        ('bulk arrays', read_points_csv),
+        ('bulk points', lambda f: load_points_csv(f, Point))
+    ]
+    
+    print(f"  Size: {size_mb:.2f} MB")
+    print(f"{'Loader':<15} {'Time (ms)':<12} {'MB/s':<10} {'Speedup':<10}")
+    print("-"*70)
+    
+    results = []
+    for name, loader in loaders:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            loader(filepath)
+            best = min(best, time.perf_counter() - start)
+        
+        results.append({'loader': name, 'time': best * 1000, 'mb_per_s': size_mb / best})
+        speedup = results[0]['time'] / results[-1]['time']
+        print(f"{name:<15} {best * 1000:<12.2f} {size_mb / best:<10.1f} {speedup:<10.2f}")
+    
+    return results
+
+
+def _benchmark_rows(cases, solve, repeats, warmup):
+    print(f"{'File':<32} {'Size':<9} {'Median (ms)':<13} {'p95 (ms)':<10} {'95% CI (ms)':<20}")
+    print("-"*90)
+    
+    rows = []
+    for filename, size, args in cases:
+        stats = summarize(run_trials(solve, args, repeats, warmup))
+        rows.append(dict(stats, file=filename, size=size))
+        ci = f"{stats['ci95_lo_ns'] / 1e6:.3f} - {stats['ci95_hi_ns'] / 1e6:.3f}"
+        print(f"{filename:<32} {size:<9} {stats['median_ns'] / 1e6:<13.3f} {stats['p95_ns'] / 1e6:<10.3f} {ci:<20}")
+    return rows
+
+
+def _print_fit(fit):
+    if fit is None:
+        print("  not enough sizes to fit a growth exponent")
+        return
+    print(f"  measured exponent: {fit['exponent']:.3f}  "
+          f"(a pure {fit['claimed']} curve gives {fit['claimed_exponent']:.3f} over these sizes)")
+    print(f"  best fitting model: {fit['best_model']}  "
+          + ", ".join(f"{name}: {err:.3f}" for name, err in fit['rms_log_residual'].items()))
+
+
+def run_benchmark_suite(engine='dc', mult_engine='karatsuba', mult_folder='datasets/multiplication',
+                        repeats=15, warmup=3, prefix='results/benchmark_results', mult_threshold=None):
+    print("\n" + "="*70)
+    print("BENCHMARK SUITE")
+    print(f"engines: {engine}, {describe_engine(mult_engine, mult_threshold)}  trials: {repeats}  warm-up: {warmup}")
+    print("="*70)
+    
+    benchmarks = []
+    
+    folder = 'datasets/closest_pair'
+    cases = []
+    for filename in list_datasets(folder):
+        points = load_closest_pair_from_file(os.path.join(folder, filename))
+        cases.append((filename, len(points), (points,)))
+    
+    print("\nclosest pair")
+    rows = _benchmark_rows(cases, get_closest_pair_engine(engine), repeats, warmup)
+    fit = fit_growth([r['size'] for r in rows], [r['median_ns'] for r in rows], 'n log n')
+    _print_fit(fit)
+    benchmarks.append({'name': 'closest_pair', 'engine': engine, 'rows': rows, 'fit': fit})
+    
+    cases = []
+    for filename in list_datasets(mult_folder):
+        num1, num2 = load_multiplication_from_file(os.path.join(mult_folder, filename))
+        cases.append((filename, max(digit_count(num1), digit_count(num2)), (num1, num2)))
+    
+    print("\nmultiplication")
+    rows = _benchmark_rows(cases, get_multiplication_engine(mult_engine, mult_threshold), repeats, warmup)
+    fit = fit_growth([r['size'] for r in rows], [r['median_ns'] for r in rows], 'n^1.585')
+    _print_fit(fit)
+    benchmarks.append({'name': 'multiplication', 'engine': mult_engine,
+                       'threshold_bits': engine_threshold(mult_engine, mult_threshold), 'rows': rows, 'fit': fit})
+    
+    report = {
+        'environment': environment(),
+        'repeats': repeats,
+        'warmup': warmup,
+        'benchmarks': benchmarks
+    }
+    json_path, csv_path = write_results(prefix, report)
+    print(f"\nwrote {json_path} and {csv_path}")
+    return report
+
+
+def _overhead_rows(variants, repeats, warmup):
+    print(f"{'Variant':<16} {'Median (ms)':<13} {'95% CI (ms)':<20} {'vs before':<10}")
+    print("-"*70)
+    
+    rows = []
+    for name, solve in variants:
+        stats = summarize(run_trials(solve, (), repeats, warmup))
+        rows.append(dict(stats, variant=name))
+        ratio = stats['median_ns'] / rows[0]['median_ns']
+        ci = f"{stats['ci95_lo_ns'] / 1e6:.3f} - {stats['ci95_hi_ns'] / 1e6:.3f}"
+        print(f"{name:<16} {stats['median_ns'] / 1e6:<13.3f} {ci:<20} {ratio:<10.3f}")
+    return rows
+
+
+def _unlimited_int_str(fn):
+    # the frozen baseline sizes operands with len(str(x)); lift the int/str
+    # digit limit for its calls only, not for the whole process
+    def run():
+        limit = sys.get_int_max_str_digits()
+        sys.set_int_max_str_digits(0)
+        try:
+            return fn()
+        finally:
+            sys.set_int_max_str_digits(limit)
+    return run
+
+
+def run_trace_overhead_benchmark(points_file, numbers_file, repeats=15, warmup=3):
+    # "before" is the pre-tracer Q3 code, "untraced" the shared version with
+    # no tracer, "no-op tracer" pays only for the hook calls and "step log"
+    # is what the gui attaches (compact records into a ring buffer)
+    print("\n" + "="*70)
+    print("TRACER OVERHEAD")
+    print(f"trials: {repeats}  warm-up: {warmup}")
+    print("="*70)
+    
+    points = load_closest_pair_from_file(points_file)
+    print(f"\nclosest pair: {os.path.basename(points_file)} ({len(points)} points)")
+    
+    def cp_steps():
+        log = StepLog()
+        closest_pair(points, ClosestPairSteps(points, emit=log.append))
+    
+    cp_rows = _overhead_rows([
+        ('before', lambda: trace_baseline.closest_pair(points)),
+        ('untraced', lambda: closest_pair(points)),
+        ('no-op tracer', lambda: closest_pair(points, Tracer())),
+        ('step log', cp_steps)
+    ], repeats, warmup)
+    
+    num1, num2 = load_multiplication_from_file(numbers_file)
+    digits = max(digit_count(num1), digit_count(num2))
+    print(f"\nkaratsuba: {os.path.basename(numbers_file)} ({digits} digits)")
+    
+    def ka_steps():
+        log = StepLog()
+        karatsuba_multiply(num1, num2, KaratsubaSteps(num1, num2, emit=log.append))
+    
+    ka_rows = _overhead_rows([
+        ('before', _unlimited_int_str(lambda: trace_baseline.karatsuba_multiply(num1, num2))),
+        ('untraced', lambda: karatsuba_multiply(num1, num2)),
+        ('no-op tracer', lambda: karatsuba_multiply(num1, num2, Tracer())),
+        ('step log', ka_steps)
+    ], repeats, warmup)
+    
+    return {'closest_pair': cp_rows, 'karatsuba': ka_rows}
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--engine', default='dc', choices=CLOSEST_PAIR_ENGINES)
+    parser.add_argument('--mult-engine', default='karatsuba', choices=MULTIPLICATION_ENGINES)
+    parser.add_argument('--mult-threshold', type=int, metavar='BITS')
+    parser.add_argument('--count-distances', action='store_true')
+    parser.add_argument('--parallel-speedup', metavar='FILE')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--queries', metavar='FILE')
+    parser.add_argument('-k', type=int, default=5)
+    parser.add_argument('--dynamic', metavar='FILE')
+    parser.add_argument('--updates', type=int, default=200)
+    parser.add_argument('--external', metavar='FILE')
+    parser.add_argument('--budget-mb', type=float, default=64)
+    parser.add_argument('--strict-budget', action='store_true')
+    parser.add_argument('--point-memory', metavar='FILE')
+    parser.add_argument('--mult-timings', action='store_true')
+    parser.add_argument('--mult-folder', default='datasets/multiplication')
+    parser.add_argument('--mult-parallel', metavar='FILE')
+    parser.add_argument('--levels', type=int, choices=[1, 2])
+    parser.add_argument('--min-bits', type=int, default=PARALLEL_MIN_BITS)
+    parser.add_argument('--mult-unbalanced', nargs='?', const='datasets/multiplication_unbalanced', metavar='FOLDER')
+    parser.add_argument('--parse-benchmark', metavar='FILE')
+    parser.add_argument('--benchmark', action='store_true')
+    parser.add_argument('--repeats', type=int, default=15)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--bench-out', default='results/benchmark_results')
+    parser.add_argument('--trace-overhead', nargs=2, metavar=('POINTS', 'NUMBERS'))
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        run_benchmark_suite(args.engine, args.mult_engine, args.mult_folder,
+                            args.repeats, args.warmup, args.bench_out, args.mult_threshold)
+        sys.exit(0)
+    
+    if args.trace_overhead:
+        run_trace_overhead_benchmark(*args.trace_overhead, args.repeats, args.warmup)
+        sys.exit(0)
+    
+    if args.parse_benchmark:
+        run_parse_benchmark(args.parse_benchmark)
+        sys.exit(0)
+    
+    if args.mult_parallel:
+        run_parallel_multiplication_benchmark(args.mult_parallel, args.workers, args.levels, args.min_bits)
+        sys.exit(0)
+    
+    if args.mult_unbalanced:
+        run_unbalanced_multiplication_benchmark(args.mult_unbalanced, args.mult_threshold,
+                                                args.repeats, args.warmup)
+        sys.exit(0)
+    
+    if args.mult_timings:
+        run_multiplication_timing_table(args.mult_folder)
+        sys.exit(0)
+    
+    if args.point_memory:
+        report_point_memory(args.point_memory)
+        sys.exit(0)
+    
+    if args.external:
+        test_external_closest_pair(args.external, args.budget_mb, args.strict_budget)
+        sys.exit(0)
+    
+    if args.dynamic:
+        run_dynamic_closest_pair_benchmark(args.dynamic, args.updates)
+        sys.exit(0)
+    
+    if args.queries:
+        test_closest_pair_queries(args.queries, args.k)
+        sys.exit(0)
+    
+    if args.parallel_speedup:
+        run_parallel_speedup_benchmark(args.parallel_speedup, args.workers)
+        sys.exit(0)
+    
+    if args.count_distances:
+        run_distance_count_comparison()
+        sys.exit(0)
+    
     print("\n" + "="*70)
     print("APPLYING ALGORITHMS ON ALL INPUT DATASETS")
     print("="*70)
     
-    cp_results = run_all_closest_pair_tests()
+    cp_results = run_all_closest_pair_tests(args.engine)
     
-    mult_results = run_all_multiplication_tests()
+    mult_results = run_all_multiplication_tests(args.mult_engine, args.mult_folder, args.mult_threshold)
     
     print("\n" + "="*70)
     print("ALL TESTS COMPLETED")
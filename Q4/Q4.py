@@ -1,134 +1,135 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import math
+from tkinter import font as tkfont
+import os
+import sys
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.colors import LogNorm
+from matplotlib.patches import Rectangle
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
 import time
+import queue
+import threading
+from itertools import islice
+import numpy as np
 
-class Point:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-    
-    def __repr__(self):
-        return f"({self.x:.2f}, {self.y:.2f})"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-def distance(p1, p2):
-    return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
+from dnc.point import Point
+from dnc.closest_pair import closest_pair
+from dnc.multiply import karatsuba_multiply
+from dnc.kdtree import load_or_build_index
+from dnc.decimal_io import int_to_str, str_to_int, digit_count
+from dnc.csv_io import load_points_csv
+from dnc.binary_io import read_points, read_integers, is_binary_dataset
+from dnc.point_cloud import PointCloud
+from dnc.replay import ClosestPairReplay
+from dnc.step_log import (StepLog, ClosestPairSteps, KaratsubaSteps, sampling_depth,
+                           estimate_closest_pair_steps, estimate_karatsuba_steps)
 
-def brute_force_closest(points, callback=None):
-    min_dist = float('inf')
-    pair = None
-    n = len(points)
-    
-    if callback:
-        callback(f"brute force checking {n} points", points, None, None)
-    
-    for i in range(n):
-        for j in range(i + 1, n):
-            dist = distance(points[i], points[j])
-            if (dist < min_dist):
-                min_dist = dist
-                pair = (points[i], points[j])
-    
-    return min_dist, pair
+# the tk loop drains worker steps every POLL_MS, spending at most
+# POLL_BUDGET seconds per tick so the window stays responsive
+POLL_MS = 30
+POLL_BUDGET = 0.02
+# runs expected to report more steps than this only record the top levels
+MAX_STEPS = 200000
+# point sets larger than this are plotted per view (density raster or the
+# visible points only) and re-rendered on pan/zoom; DENSITY_CELL_PX is the
+# raster cell size in screen pixels
+LARGE_PLOT_POINTS = 50000
+DENSITY_CELL_PX = 2
+# replay ticks every REPLAY_MS and strides so a whole recording plays in
+# about REPLAY_SECONDS, however many steps it has
+REPLAY_MS = 30
+REPLAY_SECONDS = 20
 
-def strip_closest(strip, d, callback=None):
-    min_dist = d
-    pair = None
-    strip.sort(key=lambda p: p.y)
-    
-    if callback:
-        callback(f'checking strip with {len(strip)} points', strip, None, min_dist)
-    
-    for i in range(len(strip)):
-        j = i + 1
-        while j < len(strip) and (strip[j].y - strip[i].y) < min_dist:
-            dist = distance(strip[i], strip[j])
-            if dist < min_dist:
-                min_dist = dist
-                pair = (strip[i], strip[j])
-            j += 1
-    
-    return min_dist, pair
 
-def closest_pair_recursive(points_x, points_y, callback=None):
-    n = len(points_x)
-    
-    if n <= 3:
-        return brute_force_closest(points_x, callback)
-    
-    mid = n // 2
-    mid_point = points_x[mid]
-    
-    if callback:
-        callback(f"dividing {n} points at x={mid_point.x:.2f}", points_x, mid_point, None)
-    
-    points_y_left = [p for p in points_y if p.x <= mid_point.x]
-    points_y_right = [p for p in points_y if p.x > mid_point.x]
-    
-    left_dist, left_pair = closest_pair_recursive(points_x[:mid], points_y_left, callback)
-    right_dist, right_pair = closest_pair_recursive(points_x[mid:], points_y_right, callback)
-    
-    if left_dist < right_dist:
-        min_dist = left_dist
-        min_pair = left_pair
-    else:
-        min_dist = right_dist
-        min_pair = right_pair
-    
-    if callback:
-        callback(f'merging: current min = {min_dist:.4f}', None, None, min_dist)
-    
-    strip = [p for p in points_y if abs(p.x - mid_point.x) < min_dist]
-    
-    if strip:
-        strip_dist, strip_pair = strip_closest(strip, min_dist, callback)
-        if (strip_dist < min_dist):
-            min_dist = strip_dist
-            min_pair = strip_pair
-    
-    return min_dist, min_pair
+class Cancelled(Exception):
+    pass
 
-def closest_pair(points, callback=None):
-    if callback:
-        callback(f'starting with {len(points)} points', points, None, None)
-    
-    points_x = sorted(points, key=lambda p: p.x)
-    points_y = sorted(points, key=lambda p: p.y)
-    
-    return closest_pair_recursive(points_x, points_y, callback)
 
-def karatsuba_multiply(x, y, callback=None, depth=0):
-    if x < 10 or y < 10:
-        result = x * y
-        if callback:
-            callback(f"{'  '*depth}base case: {x} x {y} = {result}", x, y, result, depth)
-        return result
-    
-    n = max(len(str(x)), len(str(y)))
-    half = n // 2
-    power = 10 ** half
-    
-    high1 = x // power
-    low1 = x % power
-    high2 = y // power
-    low2 = y % power
-    
-    if callback:
-        callback(f"{'  '*depth}split: {x} = {high1}*10^{half} + {low1}", x, y, None, depth)
-    
-    z0 = karatsuba_multiply(low1, low2, callback, depth + 1)
-    z1 = karatsuba_multiply((low1 + high1), (low2 + high2), callback, depth + 1)
-    z2 = karatsuba_multiply(high1, high2, callback, depth + 1)
-    
-    result = z2 * (10 ** (2 * half)) + (z1 - z2 - z0) * power + z0
+class StepView:
+    # virtualized step list: only the rows that fit in the text widget are
+    # rendered, from compact records, and the scrollbar maps to step indexes
+    # rather than to text lines
+    def __init__(self, parent, rows=40):
+        frame = tk.Frame(parent, bg='white')
+        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        self.bar = tk.Scrollbar(frame, command=self.on_scroll)
+        self.bar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text = tk.Text(frame, font=('Courier', 10), bg='#fafafa', wrap=tk.NONE, height=rows)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.text.bind('<Configure>', self.on_resize)
+        self.text.bind('<MouseWheel>', lambda e: self.scroll_by(-1 if e.delta > 0 else 1, 3))
+        self.text.bind('<Button-4>', lambda e: self.scroll_by(-1, 3))
+        self.text.bind('<Button-5>', lambda e: self.scroll_by(1, 3))
+        
+        self.rows = rows
+        self.line_height = None
+        self.top = 0
+        self.follow = True
+        self.log = None
+        self.source = None
+        self.prefix = ''
+    
+    def set_source(self, log, source, prefix=''):
+        self.log = log
+        self.source = source
+        self.prefix = prefix
+        self.top = 0
+        self.follow = True
+        self.refresh()
+    
+    def clear(self):
+        self.set_source(None, None)
+    
+    def refresh(self):
+        self.text.delete(1.0, tk.END)
+        total = len(self.log) if self.log is not None else 0
+        if total == 0:
+            self.bar.set(0, 1)
+            return
+        
+        first = self.log.first
+        if self.follow:
+            self.top = total - self.rows
+        self.top = max(first, min(self.top, total - self.rows))
+        records = self.log.records(self.top, self.top + self.rows)
+        lines = [f"{self.prefix}{self.source.render(r)}" for r in records]
+        self.text.insert(tk.END, '\n'.join(lines))
+        
+        span = total - first
+        self.bar.set((self.top - first) / span, min(1, (self.top - first + self.rows) / span))
     
-    if callback:
-        callback(f"{'  '*depth}combine: result = {result}", x, y, result, depth)
+    def scroll_by(self, amount, step=1):
+        if self.log is None:
+            return
+        self.top += amount * step
+        self.follow = self.top + self.rows >= len(self.log)
+        self.refresh()
     
-    return result
+    def on_scroll(self, action, amount, unit=None):
+        if self.log is None:
+            return
+        if action == 'moveto':
+            first = self.log.first
+            self.top = first + int(float(amount) * (len(self.log) - first))
+            self.follow = self.top + self.rows >= len(self.log)
+            self.refresh()
+        else:
+            self.scroll_by(int(amount), self.rows if unit == 'pages' else 1)
+    
+    def on_resize(self, event):
+        if self.line_height is None:
+            self.line_height = tkfont.Font(font=('Courier', 10)).metrics('linespace')
+        rows = max(1, event.height // self.line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.refresh()
+
 
 class AlgorithmGUI:
     def __init__(self, root):
@@ -136,11 +137,30 @@ class AlgorithmGUI:
         self.root.title('Divide & Conquer Visualizer')
         self.root.geometry("1400x900")
         self.root.configure(bg='#f5f5f5')
+        self.root.protocol('WM_DELETE_WINDOW', self.close)
         
         self.current_algo = "closest_pair"
         self.data = None
+        self.data_file = None
+        self.index = None
         self.result = None
-        self.steps = []
+        self.step_log = None
+        self.step_source = None
+        self.worker = None
+        self.events = None
+        self.cancel_flag = None
+        self.ui_time = 0.0
+        self.cloud = None
+        self.cloud_ax = None
+        self.view_key = None
+        self.view_pending = None
+        self.plot_ax = None
+        self.replay = None
+        self.replay_pos = 0
+        self.replay_job = None
+        self.replay_bg = None
+        self.replay_artists = []
+        self.draw_cid = None
         
         self.create_ui()
     
@@ -183,6 +203,11 @@ class AlgorithmGUI:
                       command=self.algo_changed, font=('Arial', 11),
                       bg='white').pack(anchor=tk.W, pady=5)
         
+        self.use_index = tk.BooleanVar(value=False)
+        tk.Checkbutton(algo_frame, text='use k-d tree index (no steps)',
+                      variable=self.use_index, font=('Arial', 10),
+                      bg='white').pack(anchor=tk.W, pady=5)
+        
         file_frame = tk.LabelFrame(parent, text="Input File",
                                    font=('Arial', 13, 'bold'), bg='white',
                                    fg='#3b82f6', padx=15, pady=15)
@@ -205,7 +230,11 @@ class AlgorithmGUI:
         
         tk.Button(file_frame, text="RUN ALGORITHM", command=self.run,
                  font=('Arial', 13, 'bold'), bg='#10b981', fg='white',
-                 cursor='hand2', padx=25, pady=12).pack(fill=tk.X, pady=10)
+                 cursor='hand2', padx=25, pady=12).pack(fill=tk.X, pady=(10, 5))
+        
+        tk.Button(file_frame, text="CANCEL", command=self.cancel,
+                 font=('Arial', 11, 'bold'), bg='#ef4444', fg='white',
+                 cursor='hand2', padx=25, pady=6).pack(fill=tk.X, pady=(0, 10))
         
         stats_frame = tk.LabelFrame(parent, text='Stats', 
                                     font=('Arial', 13, 'bold'), bg='white',
@@ -233,18 +262,41 @@ class AlgorithmGUI:
         
         self.fig = Figure(figsize=(8, 6), dpi=100)
         self.canvas = FigureCanvasTkAgg(self.fig, master=viz_tab)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, viz_tab)
+        
+        replay_bar = tk.Frame(viz_tab, bg='white')
+        replay_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=10)
+        
+        tk.Button(replay_bar, text='<', command=lambda: self.replay_step(-1),
+                 font=('Arial', 10, 'bold'), bg='#3b82f6', fg='white',
+                 cursor='hand2', padx=8).pack(side=tk.LEFT)
+        
+        self.play_btn = tk.Button(replay_bar, text='REPLAY', command=self.toggle_replay,
+                                  font=('Arial', 10, 'bold'), bg='#10b981', fg='white',
+                                  cursor='hand2', padx=12)
+        self.play_btn.pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(replay_bar, text='>', command=lambda: self.replay_step(1),
+                 font=('Arial', 10, 'bold'), bg='#3b82f6', fg='white',
+                 cursor='hand2', padx=8).pack(side=tk.LEFT)
+        
+        self.replay_scale = tk.Scale(replay_bar, from_=0, to=0, orient=tk.HORIZONTAL,
+                                     showvalue=False, command=self.replay_seek, bg='white')
+        self.replay_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
+        
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         steps_tab = tk.Frame(self.tabs, bg='white')
         self.tabs.add(steps_tab, text='Steps')
         
-        self.steps_txt = scrolledtext.ScrolledText(steps_tab, font=('Courier', 10),
-                                                   bg='#fafafa', wrap=tk.WORD)
-        self.steps_txt.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.step_view = StepView(steps_tab)
     
     def algo_changed(self):
+        self.cancel()
         self.current_algo = self.algo_var.get()
         self.data = None
+        self.data_file = None
+        self.index = None
         self.result = None
         self.file_lbl.config(text='no file loaded')
         self.preview.delete(1.0, tk.END)
@@ -253,166 +305,510 @@ class AlgorithmGUI:
     def load_file(self):
         file = filedialog.askopenfilename(title="select input file",
                                          filetypes=[("text files", "*.txt"),
+                                                   ("binary datasets", "*.pts *.ints"),
                                                    ('all files', "*.*")])
         
         if not file:
             return
+        self.cancel()
         
         try:
+            if is_binary_dataset(file):
+                self.load_binary_file(file)
+                return
+            
+            # the preview only needs the first lines; the data is parsed once
             with open(file, 'r') as f:
-                content = f.read()
+                head = [line.rstrip('\n') for line in islice(f, 20)]
+                if self.current_algo == "closest_pair":
+                    data = load_points_csv(file, Point)
+                    more = len(data) - len(head)
+                else:
+                    nums = [str_to_int(line) for line in head if line.strip()]
+                    more = 0
+                    for line in f:
+                        more += 1
+                        if line.strip():
+                            nums.append(str_to_int(line))
+                    if len(nums) < 2:
+                        raise ValueError('need two numbers')
+                    data = (nums[0], nums[1])
             
+            self.data = data
+            self.data_file = file
+            self.index = None
             self.file_lbl.config(text=f"loaded: {file.split('/')[-1]}")
             self.preview.delete(1.0, tk.END)
             
-            lines = content.split('\n')
-            prev = '\n'.join(lines[:20])
-            if (len(lines) > 20):
-                prev += f"\n... ({len(lines)-20} more lines)"
+            prev = '\n'.join(head)
+            if more > 0:
+                prev += f"\n... ({more} more lines)"
             
             self.preview.insert(1.0, prev)
             
-            if self.current_algo == "closest_pair":
-                pts = []
-                for line in lines:
-                    if line.strip():
-                        x, y = map(float, line.strip().split(','))
-                        pts.append(Point(x, y))
-                self.data = pts
-            else:
-                nums = [int(line.strip()) for line in lines if line.strip()]
-                if len(nums) >= 2:
-                    self.data = (nums[0], nums[1])
-            
             self.clear_all()
             
         except Exception as e:
             messagebox.showerror('error', f"failed to load:\n{str(e)}")
     
+    def load_binary_file(self, file):
+        if self.current_algo == "closest_pair":
+            data = read_points(file, Point)
+            lines = [f"{p.x},{p.y}" for p in data[:20]]
+            if (len(data) > 20):
+                lines.append(f"... ({len(data)-20} more points)")
+        else:
+            nums = read_integers(file)
+            if len(nums) < 2:
+                raise ValueError('need two numbers')
+            data = (nums[0], nums[1])
+            lines = []
+            for num in data:
+                s = int_to_str(num)
+                lines.append(f"{s[:50]}... ({len(s)} digits)" if len(s) > 50 else s)
+        
+        self.data = data
+        self.data_file = file
+        self.index = None
+        self.file_lbl.config(text=f"loaded: {file.split('/')[-1]}")
+        self.preview.delete(1.0, tk.END)
+        self.preview.insert(1.0, '\n'.join(lines))
+        
+        self.clear_all()
+    
     def run(self):
         if not self.data:
             messagebox.showwarning("no data", 'load a file first')
             return
+        if self.worker is not None:
+            messagebox.showwarning("busy", 'an algorithm is already running')
+            return
         
-        self.steps = []
+        self.stop_replay()
         self.results_txt.delete(1.0, tk.END)
-        self.steps_txt.delete(1.0, tk.END)
+        self.stats.config(text='running...')
+        
+        if self.step_log is not None:
+            self.step_log.close()
+        self.step_log = StepLog(spill=True)
+        if self.current_algo == "closest_pair":
+            depth = sampling_depth(2, estimate_closest_pair_steps(len(self.data)), MAX_STEPS)
+            self.step_source = ClosestPairSteps(self.data, depth, self.step)
+            self.step_view.set_source(self.step_log, self.step_source, '> ')
+        else:
+            digits = max(digit_count(self.data[0]), digit_count(self.data[1]))
+            depth = sampling_depth(3, estimate_karatsuba_steps(digits), MAX_STEPS)
+            self.step_source = KaratsubaSteps(self.data[0], self.data[1], depth, self.step)
+            self.step_view.set_source(self.step_log, self.step_source)
+        
+        self.events = queue.Queue()
+        self.cancel_flag = threading.Event()
+        self.ui_time = 0.0
+        
+        if self.current_algo == "closest_pair":
+            target = self.solve_closest_pair
+            args = (self.data, self.use_index.get(), self.index, self.data_file)
+        else:
+            target = self.solve_karatsuba
+            args = self.data
         
+        self.worker = threading.Thread(target=self.work, args=(target, args), daemon=True)
+        self.worker.start()
+        self.root.after(POLL_MS, self.poll)
+    
+    def cancel(self):
+        if self.worker is not None:
+            self.cancel_flag.set()
+    
+    # ---- worker thread: no tk calls in here, only the events queue ----
+    
+    def work(self, target, args):
+        events = self.events
         try:
-            if self.current_algo == "closest_pair":
-                self.run_closest_pair()
-            else:
-                self.run_karatsuba()
-            
-            self.tabs.select(0)
-            
+            start = time.perf_counter()
+            result = target(*args)
+            events.put(('done', (result, time.perf_counter() - start)))
+        except Cancelled:
+            events.put(('cancelled', None))
         except Exception as e:
-            messagebox.showerror('error', f"failed:\n{str(e)}")
-    
-    def run_closest_pair(self):
-        self.results_txt.insert(tk.END, "="*60 + "\n")
-        self.results_txt.insert(tk.END, 'CLOSEST PAIR ALGORITHM\n')
-        self.results_txt.insert(tk.END, "="*60 + "\n\n")
+            events.put(('error', str(e)))
+    
+    def step(self, record):
+        if self.cancel_flag.is_set():
+            raise Cancelled()
+        # only the compact record crosses the thread boundary
+        self.events.put(('step', record))
+    
+    def solve_closest_pair(self, data, use_index, index, data_file):
+        tracer = self.step_source
+        
+        if use_index:
+            if index is None:
+                index = load_or_build_index(data, data_file)
+                tracer.index_ready(len(index))
+            min_d, i, j = index.closest_pair()
+            pair = (data[i], data[j])
+            tracer.index_answer(min_d)
+        else:
+            min_d, pair = closest_pair(data, tracer)
+        return min_d, pair, index
+    
+    def solve_karatsuba(self, n1, n2):
+        return karatsuba_multiply(n1, n2, self.step_source)
+    
+    # ---- main thread: drain the queue in batches on after() ticks ----
+    
+    def poll(self):
+        start = time.perf_counter()
+        added = 0
+        finished = None
+        while time.perf_counter() - start < POLL_BUDGET:
+            try:
+                kind, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'step':
+                self.step_log.append(value)
+                added += 1
+            else:
+                finished = (kind, value)
+                break
         
-        start = time.time()
+        if added or finished is not None:
+            self.step_view.refresh()
+        self.ui_time += time.perf_counter() - start
         
-        def callback(msg, pts, mid, dist):
-            self.steps.append((msg, pts, mid, dist))
-            self.steps_txt.insert(tk.END, f"> {msg}\n")
-            self.steps_txt.see(tk.END)
-            self.root.update_idletasks()
+        if finished is None:
+            self.root.after(POLL_MS, self.poll)
+        else:
+            self.finish(*finished)
+    
+    def finish(self, kind, value):
+        self.worker = None
+        if kind == 'done' and self.cancel_flag.is_set():
+            kind = 'cancelled'
         
-        min_d, pair = closest_pair(self.data, callback)
-        end = time.time()
+        if kind == 'error':
+            self.stats.config(text='run algorithm to see stats')
+            messagebox.showerror('error', f"failed:\n{value}")
+            return
+        if kind == 'cancelled':
+            self.results_txt.insert(tk.END, f"cancelled after {len(self.step_log)} steps\n")
+            self.stats.config(text=f'cancelled after {len(self.step_log)} steps')
+            return
         
+        result, algo_time = value
+        start = time.perf_counter()
+        if self.current_algo == "closest_pair":
+            stats = self.show_closest_pair(result, algo_time)
+        else:
+            stats = self.show_karatsuba(result, algo_time)
+        self.tabs.select(0)
+        self.ui_time += time.perf_counter() - start
+        
+        self.results_txt.insert(tk.END, f"ui time: {self.ui_time*1000:.2f} ms\n")
+        if self.step_source.skipped:
+            self.results_txt.insert(tk.END, f"steps: {len(self.step_log)} recorded down to depth "
+                                            f"{self.step_source.max_depth}, {self.step_source.skipped} deeper ones skipped\n")
+        else:
+            self.results_txt.insert(tk.END, f"steps: {len(self.step_log)}\n")
+        self.stats.config(text=f"{stats}\nalgorithm: {algo_time*1000:.2f} ms\nui: {self.ui_time*1000:.2f} ms")
+    
+    def show_closest_pair(self, result, algo_time):
+        min_d, pair, self.index = result
         self.result = (min_d, pair)
         
+        self.results_txt.insert(tk.END, "="*60 + "\n")
+        self.results_txt.insert(tk.END, 'CLOSEST PAIR ALGORITHM\n')
+        self.results_txt.insert(tk.END, "="*60 + "\n\n")
+        
         self.results_txt.insert(tk.END, f'points: {len(self.data)}\n\n')
         self.results_txt.insert(tk.END, f"minimum distance: {min_d:.6f}\n\n")
         self.results_txt.insert(tk.END, f'closest pair:\n')
         self.results_txt.insert(tk.END, f"  p1: {pair[0]}\n")
         self.results_txt.insert(tk.END, f'  p2: {pair[1]}\n\n')
-        self.results_txt.insert(tk.END, f"time: {(end-start)*1000:.2f} ms\n")
-        
-        self.stats.config(text=f'points: {len(self.data)}\nmin dist: {min_d:.4f}\ntime: {(end-start)*1000:.2f} ms')
+        self.results_txt.insert(tk.END, f"algorithm time: {algo_time*1000:.2f} ms\n")
         
         self.visualize_cp()
+        return f'points: {len(self.data)}\nmin dist: {min_d:.4f}'
     
-    def run_karatsuba(self):
+    def show_karatsuba(self, res, algo_time):
+        n1, n2 = self.data
+        self.result = res
+        
         self.results_txt.insert(tk.END, "="*60 + "\n")
         self.results_txt.insert(tk.END, "KARATSUBA MULTIPLICATION\n")
         self.results_txt.insert(tk.END, "="*60 + "\n\n")
         
-        n1, n2 = self.data
-        start = time.time()
-        
-        def callback(msg, x, y, res, d):
-            self.steps.append((msg, x, y, res))
-            self.steps_txt.insert(tk.END, f"{msg}\n")
-            if (len(self.steps) % 10 == 0):
-                self.steps_txt.see(tk.END)
-                self.root.update_idletasks()
-        
-        res = karatsuba_multiply(n1, n2, callback)
-        end = time.time()
-        
-        self.result = res
+        # one string per number; the digit counts below reuse them
+        s1 = int_to_str(n1)
+        s2 = int_to_str(n2)
+        sr = int_to_str(res)
         
-        self.results_txt.insert(tk.END, f'num1 ({len(str(n1))} digits):\n')
-        s1 = str(n1)
+        self.results_txt.insert(tk.END, f'num1 ({len(s1)} digits):\n')
         if len(s1) > 100:
             self.results_txt.insert(tk.END, f"{s1[:50]}...{s1[-50:]}\n\n")
         else:
-            self.results_txt.insert(tk.END, f"{n1}\n\n")
+            self.results_txt.insert(tk.END, f"{s1}\n\n")
         
-        self.results_txt.insert(tk.END, f"num2 ({len(str(n2))} digits):\n")
-        s2 = str(n2)
+        self.results_txt.insert(tk.END, f"num2 ({len(s2)} digits):\n")
         if (len(s2) > 100):
             self.results_txt.insert(tk.END, f"{s2[:50]}...{s2[-50:]}\n\n")
         else:
-            self.results_txt.insert(tk.END, f"{n2}\n\n")
+            self.results_txt.insert(tk.END, f"{s2}\n\n")
         
-        self.results_txt.insert(tk.END, f'result ({len(str(res))} digits):\n')
-        sr = str(res)
+        self.results_txt.insert(tk.END, f'result ({len(sr)} digits):\n')
         if len(sr) > 100:
             self.results_txt.insert(tk.END, f"{sr[:50]}...{sr[-50:]}\n\n")
         else:
-            self.results_txt.insert(tk.END, f"{res}\n\n")
+            self.results_txt.insert(tk.END, f"{sr}\n\n")
         
         exp = n1 * n2
         ok = res == exp
         self.results_txt.insert(tk.END, f"verification: {'PASS' if ok else 'FAIL'}\n")
-        self.results_txt.insert(tk.END, f'time: {(end-start)*1000:.2f} ms\n')
+        self.results_txt.insert(tk.END, f'algorithm time: {algo_time*1000:.2f} ms\n')
         
-        self.stats.config(text=f"digits: {len(str(n1))}, {len(str(n2))}\nresult: {len(str(res))} digits\ntime: {(end-start)*1000:.2f} ms\nverified: {'yes' if ok else 'no'}")
+        return f"digits: {len(s1)}, {len(s2)}\nresult: {len(sr)} digits\nverified: {'yes' if ok else 'no'}"
     
     def visualize_cp(self):
         if not self.result or self.current_algo != "closest_pair":
             return
         
+        self.stop_replay()
         self.fig.clear()
         ax = self.fig.add_subplot(111)
+        self.plot_ax = ax
+        self.cloud_ax = None
         
-        xs = [p.x for p in self.data]
-        ys = [p.y for p in self.data]
-        ax.scatter(xs, ys, c='blue', alpha=0.5, s=25)
+        if len(self.data) > LARGE_PLOT_POINTS:
+            self.setup_cloud(ax)
+        else:
+            xs = [p.x for p in self.data]
+            ys = [p.y for p in self.data]
+            ax.scatter(xs, ys, c='blue', alpha=0.5, s=25)
         
         min_d, pair = self.result
         ax.scatter([pair[0].x, pair[1].x], [pair[0].y, pair[1].y],
                   c='red', s=120, zorder=5, marker='o')
         ax.plot([pair[0].x, pair[1].x], [pair[0].y, pair[1].y],
-               'r--', linewidth=2.5)
+               'r--', linewidth=2.5, zorder=5)
         
         ax.set_xlabel('x coordinate')
         ax.set_ylabel('y coordinate')
         ax.set_title(f'closest pair visualization (distance = {min_d:.2f})')
         ax.grid(True, alpha=0.3)
         
+        if self.cloud_ax is not None:
+            self.render_view()
+        self.canvas.draw()
+    
+    # ---- large point sets: only the current view is rendered ----
+    
+    def setup_cloud(self, ax):
+        if self.cloud is None:
+            self.cloud = PointCloud.from_points(self.data)
+        x0, x1, y0, y1 = self.cloud.bounds
+        pad_x = (x1 - x0) * 0.02 or 1.0
+        pad_y = (y1 - y0) * 0.02 or 1.0
+        ax.set_xlim(x0 - pad_x, x1 + pad_x)
+        ax.set_ylim(y0 - pad_y, y1 + pad_y)
+        ax.set_autoscale_on(False)
+        
+        # both artists are created once and only get new data per view
+        self.cloud_image = ax.imshow(np.ma.masked_all((1, 1)), origin='lower', aspect='auto',
+                                     cmap='Blues', norm=LogNorm(vmin=1, vmax=2),
+                                     interpolation='nearest', zorder=1)
+        self.cloud_points, = ax.plot([], [], 'o', color='blue', alpha=0.5, markersize=5,
+                                     linestyle='none', zorder=2)
+        self.cloud_ax = ax
+        self.view_key = None
+        ax.callbacks.connect('xlim_changed', self.view_changed)
+        ax.callbacks.connect('ylim_changed', self.view_changed)
+    
+    def view_changed(self, ax):
+        # a zoom changes both limits; render once after the last change
+        if self.view_pending is None:
+            self.view_pending = self.root.after_idle(self.refresh_view)
+    
+    def refresh_view(self):
+        self.view_pending = None
+        if self.cloud_ax is not None and self.render_view():
+            self.canvas.draw_idle()
+    
+    def render_view(self):
+        ax = self.cloud_ax
+        x0, x1 = ax.get_xlim()
+        y0, y1 = ax.get_ylim()
+        box = ax.get_window_extent()
+        width = max(1, int(box.width) // DENSITY_CELL_PX)
+        height = max(1, int(box.height) // DENSITY_CELL_PX)
+        key = (x0, x1, y0, y1, width, height)
+        if key == self.view_key:
+            return False
+        self.view_key = key
+        
+        kind, a, b = self.cloud.view(x0, x1, y0, y1, width, height)
+        if kind == 'points':
+            self.cloud_points.set_data(a, b)
+            self.cloud_image.set_visible(False)
+        else:
+            self.cloud_points.set_data([], [])
+            self.cloud_image.set_data(np.ma.masked_equal(a, 0))
+            self.cloud_image.set_extent((min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)))
+            self.cloud_image.set_clim(1, max(2, int(a.max())))
+            self.cloud_image.set_visible(True)
+        return True
+    
+    # ---- step replay: recorded steps drawn over the plot with blitting ----
+    
+    def start_replay(self):
+        if self.replay is not None:
+            return True
+        if (self.current_algo != "closest_pair" or not self.result or self.plot_ax is None
+                or self.worker is not None or not self.step_log):
+            return False
+        
+        self.replay = ClosestPairReplay(self.step_log)
+        self.replay_pos = 0
+        self.replay_scale.config(to=max(0, len(self.replay) - 1))
+        
+        # the artists are animated: a normal draw skips them, so the
+        # background saved after each full draw is the plain plot
+        ax = self.plot_ax
+        band = ax.get_xaxis_transform()
+        self.replay_active = Rectangle((0, 0), 0, 1, transform=band, color='#10b981',
+                                       alpha=0.12, animated=True)
+        self.replay_strip = Rectangle((0, 0), 0, 1, transform=band, color='#f59e0b',
+                                      alpha=0.35, animated=True)
+        self.replay_mids = LineCollection([], colors='#3b82f6', linewidths=1.5,
+                                          transform=band, animated=True)
+        self.replay_text = ax.text(0.01, 0.99, '', transform=ax.transAxes, va='top',
+                                   fontsize=9, animated=True,
+                                   bbox=dict(facecolor='white', alpha=0.8, edgecolor='#cccccc'))
+        ax.add_patch(self.replay_active)
+        ax.add_patch(self.replay_strip)
+        ax.add_collection(self.replay_mids, autolim=False)
+        self.replay_artists = [self.replay_active, self.replay_strip, self.replay_mids, self.replay_text]
+        
+        self.draw_cid = self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.update_replay_artists(self.replay.seek(self.replay.first))
         self.canvas.draw()
+        return True
+    
+    def stop_replay(self):
+        self.pause_replay()
+        if self.draw_cid is not None:
+            self.canvas.mpl_disconnect(self.draw_cid)
+            self.draw_cid = None
+        for artist in self.replay_artists:
+            artist.remove()
+        self.replay_artists = []
+        self.replay = None
+        self.replay_bg = None
+        self.replay_pos = 0
+        self.replay_scale.config(to=0)
+    
+    def on_draw(self, event):
+        # full redraws (resize, pan, zoom) invalidate the saved background
+        self.replay_bg = self.canvas.copy_from_bbox(self.plot_ax.bbox)
+        for artist in self.replay_artists:
+            self.plot_ax.draw_artist(artist)
+    
+    def update_replay_artists(self, state):
+        xs = self.step_source.xs
+        self.replay_mids.set_segments([[(xs[r], 0), (xs[r], 1)] for r in state.mids])
+        
+        if state.active is not None and state.active[1] > state.active[0]:
+            lo, hi = state.active
+            self.replay_active.set_x(xs[lo])
+            self.replay_active.set_width(xs[hi - 1] - xs[lo])
+            self.replay_active.set_visible(True)
+        else:
+            self.replay_active.set_visible(False)
+        
+        if state.strip is not None:
+            mid_rank, d, count = state.strip
+            self.replay_strip.set_x(xs[mid_rank] - d)
+            self.replay_strip.set_width(2 * d)
+            self.replay_strip.set_visible(True)
+        else:
+            self.replay_strip.set_visible(False)
+        
+        msg = self.step_source.render(self.step_log[state.step])
+        best = f'{state.best:.4f}' if state.best < float('inf') else '-'
+        self.replay_text.set_text(f"step {state.step - self.replay.first + 1}/{len(self.replay)}: {msg}\n"
+                                  f"current min = {best}")
+    
+    def show_replay_step(self, pos):
+        pos = max(0, min(pos, len(self.replay) - 1))
+        self.replay_pos = pos
+        self.update_replay_artists(self.replay.seek(self.replay.first + pos))
+        
+        if self.replay_bg is None:
+            self.canvas.draw()
+            return
+        # only the replay artists are redrawn over the saved background
+        self.canvas.restore_region(self.replay_bg)
+        for artist in self.replay_artists:
+            self.plot_ax.draw_artist(artist)
+        self.canvas.blit(self.plot_ax.bbox)
+    
+    def toggle_replay(self):
+        if self.replay_job is not None:
+            self.pause_replay()
+            return
+        if not self.start_replay():
+            return
+        if self.replay_pos >= len(self.replay) - 1:
+            self.replay_pos = 0
+        self.play_btn.config(text='PAUSE')
+        self.replay_job = self.root.after(REPLAY_MS, self.replay_tick)
+    
+    def pause_replay(self):
+        if self.replay_job is not None:
+            self.root.after_cancel(self.replay_job)
+            self.replay_job = None
+        self.play_btn.config(text='REPLAY')
+    
+    def replay_tick(self):
+        stride = max(1, len(self.replay) * REPLAY_MS // (REPLAY_SECONDS * 1000))
+        self.show_replay_step(self.replay_pos + stride)
+        self.replay_scale.set(self.replay_pos)
+        if self.replay_pos >= len(self.replay) - 1:
+            self.replay_job = None
+            self.pause_replay()
+        else:
+            self.replay_job = self.root.after(REPLAY_MS, self.replay_tick)
+    
+    def replay_step(self, delta):
+        if not self.start_replay():
+            return
+        self.pause_replay()
+        self.show_replay_step(self.replay_pos + delta)
+        self.replay_scale.set(self.replay_pos)
+    
+    def replay_seek(self, value):
+        # also called back when the scale is moved from replay_tick
+        pos = int(float(value))
+        if pos != self.replay_pos and self.start_replay():
+            self.show_replay_step(pos)
+    
+    def close(self):
+        # the step log spills to a temp file; release it before the window goes
+        self.cancel()
+        self.stop_replay()
+        if self.step_log is not None:
+            self.step_log.close()
+            self.step_log = None
+        self.root.destroy()
     
     def clear_all(self):
+        self.stop_replay()
+        self.cloud = None
+        self.cloud_ax = None
+        self.plot_ax = None
         self.results_txt.delete(1.0, tk.END)
-        self.steps_txt.delete(1.0, tk.END)
+        self.step_view.clear()
         self.fig.clear()
         self.canvas.draw()
         self.stats.config(text='run algorithm to see stats')
@@ -0,0 +1,157 @@
+import csv
+import gc
+import json
+import math
+import os
+import platform
+import subprocess
+import time
+
+# two-sided 95% normal quantile, used for the order-statistic interval
+# around the median
+Z95 = 1.959963984540054
+
+
+def run_trials(fn, args=(), repeats=15, warmup=3):
+    # warm-up runs fill caches and let the allocator settle; gc is switched
+    # off during each timed call so a collection does not land in one trial
+    for _ in range(warmup):
+        fn(*args)
+    samples = []
+    enabled = gc.isenabled()
+    try:
+        for _ in range(repeats):
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter_ns()
+            fn(*args)
+            samples.append(time.perf_counter_ns() - start)
+            if enabled:
+                gc.enable()
+    finally:
+        if enabled:
+            gc.enable()
+    return samples
+
+
+def _percentile(ordered, q):
+    # linear interpolation between closest ranks
+    if len(ordered) == 1:
+        return ordered[0]
+    pos = q * (len(ordered) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def median_ci(ordered):
+    # distribution-free 95% interval for the median from order statistics:
+    # the ranks n/2 -+ z*sqrt(n)/2 bracket it with ~95% probability
+    n = len(ordered)
+    half = Z95 * math.sqrt(n) / 2
+    lo = max(0, int(math.floor(n / 2 - half)))
+    hi = min(n - 1, int(math.ceil(n / 2 + half)) - 1)
+    return ordered[lo], ordered[hi]
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    n = len(ordered)
+    mean = sum(ordered) / n
+    stdev = math.sqrt(sum((s - mean)**2 for s in ordered) / (n - 1)) if n > 1 else 0.0
+    ci_lo, ci_hi = median_ci(ordered)
+    return {
+        'trials': n,
+        'min_ns': ordered[0],
+        'median_ns': _percentile(ordered, 0.5),
+        'p95_ns': _percentile(ordered, 0.95),
+        'mean_ns': mean,
+        'stdev_ns': stdev,
+        'ci95_lo_ns': ci_lo,
+        'ci95_hi_ns': ci_hi
+    }
+
+
+def _slope(xs, ys):
+    n = len(xs)
+    mx = sum(xs) / n
+    my = sum(ys) / n
+    sxx = sum((x - mx)**2 for x in xs)
+    if sxx == 0:
+        return float('nan'), my
+    slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx
+    return slope, my - slope * mx
+
+
+MODELS = {
+    'n': lambda n: n,
+    'n log n': lambda n: n * math.log2(n),
+    'n^1.585': lambda n: n ** math.log2(3),
+    'n^2': lambda n: n * n
+}
+
+
+def fit_growth(sizes, times, claimed):
+    # least-squares slope of log(time) against log(size) is the measured
+    # growth exponent. each model is also fitted as time = c * model(n)
+    # and scored by the rms of its log residuals, so "n log n" and "n^1.1"
+    # can be told apart even though both have an exponent near 1
+    points = [(n, t) for n, t in zip(sizes, times) if n > 1 and t > 0]
+    if len(points) < 2:
+        return None
+    log_n = [math.log(n) for n, _ in points]
+    log_t = [math.log(t) for _, t in points]
+    exponent, _ = _slope(log_n, log_t)
+
+    residuals = {}
+    for name, model in MODELS.items():
+        logs = [lt - math.log(model(n)) for (n, _), lt in zip(points, log_t)]
+        c = sum(logs) / len(logs)
+        residuals[name] = math.sqrt(sum((l - c)**2 for l in logs) / len(logs))
+
+    # what a pure claimed-model curve would show as an exponent over the
+    # same size range
+    expected, _ = _slope(log_n, [math.log(MODELS[claimed](n)) for n, _ in points])
+    return {
+        'exponent': exponent,
+        'claimed': claimed,
+        'claimed_exponent': expected,
+        'best_model': min(residuals, key=residuals.get),
+        'rms_log_residual': residuals
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=10,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'commit': commit,
+        'host': platform.node(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+CSV_FIELDS = ['benchmark', 'engine', 'file', 'size', 'trials', 'min_ns', 'median_ns', 'p95_ns',
+              'mean_ns', 'stdev_ns', 'ci95_lo_ns', 'ci95_hi_ns']
+
+
+def write_results(prefix, report):
+    folder = os.path.dirname(prefix)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(prefix + '.json', 'w') as f:
+        json.dump(report, f, indent=2)
+    with open(prefix + '.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for bench in report['benchmarks']:
+            for row in bench['rows']:
+                writer.writerow(dict(row, benchmark=bench['name'], engine=bench['engine']))
+    return prefix + '.json', prefix + '.csv'
@@ -0,0 +1,174 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from dnc.decimal_io import str_to_int
+from dnc.point import Point
+
+# points: header, then n little-endian float64 (x, y) pairs
+# integers: header, then per number a (sign, nbytes) record followed by the
+# magnitude as little-endian bytes, padded to a multiple of 8
+POINTS_EXT = '.pts'
+INTEGERS_EXT = '.ints'
+
+_POINTS_MAGIC = b'PTS1'
+_INTEGERS_MAGIC = b'INT1'
+_HEADER = struct.Struct('<4sQ')
+_RECORD = struct.Struct('<qQ')
+
+
+def _as_doubles(values):
+    # array('d') copy of a float sequence; float64 buffers (arrays, numpy)
+    # are copied in one go instead of element by element
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return array('d', values)
+    with view:
+        if view.format == 'd' and view.c_contiguous:
+            doubles = array('d')
+            doubles.frombytes(view.cast('B'))
+            return doubles
+    return array('d', values)
+
+
+def write_points_arrays(filename, xs, ys):
+    n = len(xs)
+    coords = array('d', bytes(16 * n))
+    coords[0::2] = _as_doubles(xs)
+    coords[1::2] = _as_doubles(ys)
+    if sys.byteorder == 'big':
+        coords.byteswap()
+    with open(filename, 'wb') as f:
+        f.write(_HEADER.pack(_POINTS_MAGIC, n))
+        coords.tofile(f)
+
+
+def write_points(filename, points):
+    write_points_arrays(filename, [p.x for p in points], [p.y for p in points])
+
+
+def write_integers(filename, nums):
+    with open(filename, 'wb') as f:
+        f.write(_HEADER.pack(_INTEGERS_MAGIC, len(nums)))
+        for num in nums:
+            nbytes = (abs(num).bit_length() + 63) // 64 * 8
+            f.write(_RECORD.pack(-1 if num < 0 else 1, nbytes))
+            f.write(abs(num).to_bytes(nbytes, 'little'))
+
+
+def _open_mapped(filename, magic):
+    with open(filename, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mm) < _HEADER.size:
+        mm.close()
+        raise ValueError(f"{filename} is too short for a header")
+    found, count = _HEADER.unpack_from(mm, 0)
+    if found != magic:
+        mm.close()
+        raise ValueError(f"{filename} is not a {magic.decode()} file")
+    return mm, count
+
+
+class PointFile:
+    # memory-mapped view of a points file. coords is a flat float64 view of
+    # the mapping (x0, y0, x1, y1, ...) and xs / ys are strided views of it,
+    # so nothing is copied until points() or tolist() is called
+    def __init__(self, filename):
+        self.mm, self.n = _open_mapped(filename, _POINTS_MAGIC)
+        if len(self.mm) < _HEADER.size + 16 * self.n:
+            self.mm.close()
+            raise ValueError(f"{filename} holds fewer than {self.n} points")
+        if sys.byteorder == 'big':
+            swapped = array('d', self.mm[_HEADER.size:_HEADER.size + 16 * self.n])
+            swapped.byteswap()
+            self.coords = memoryview(swapped)
+        else:
+            self.coords = memoryview(self.mm)[_HEADER.size:_HEADER.size + 16 * self.n].cast('d')
+        self.xs = self.coords[0::2]
+        self.ys = self.coords[1::2]
+
+    def __len__(self):
+        return self.n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def points(self, point_type):
+        return [point_type(x, y) for x, y in zip(self.xs.tolist(), self.ys.tolist())]
+
+    def close(self):
+        self.xs.release()
+        self.ys.release()
+        self.coords.release()
+        self.mm.close()
+
+
+def read_points(filename, point_type):
+    with PointFile(filename) as pf:
+        return pf.points(point_type)
+
+
+def read_integers(filename):
+    mm, count = _open_mapped(filename, _INTEGERS_MAGIC)
+    nums = []
+    try:
+        with memoryview(mm) as view:
+            offset = _HEADER.size
+            for _ in range(count):
+                sign, nbytes = _RECORD.unpack_from(mm, offset)
+                offset += _RECORD.size
+                if offset + nbytes > len(mm):
+                    raise ValueError(f"{filename} is truncated")
+                with view[offset:offset + nbytes] as limbs:
+                    num = int.from_bytes(limbs, 'little')
+                nums.append(-num if sign < 0 else num)
+                offset += nbytes
+    finally:
+        mm.close()
+    return nums
+
+
+def is_binary_dataset(filename):
+    return filename.endswith((POINTS_EXT, INTEGERS_EXT))
+
+
+def convert_file(filename):
+    # a text dataset is a points file if its first line is "x,y"
+    with open(filename, 'r') as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if not lines:
+        raise ValueError(f"{filename} is empty")
+    stem = os.path.splitext(filename)[0]
+
+    if ',' in lines[0]:
+        points = []
+        for line in lines:
+            x, y = map(float, line.split(','))
+            points.append(Point(x, y))
+        out = stem + POINTS_EXT
+        write_points(out, points)
+    else:
+        out = stem + INTEGERS_EXT
+        write_integers(out, [str_to_int(line) for line in lines])
+    return out
+
+
+def convert_tree(folder):
+    written = []
+    skipped = []
+    for dirpath, _, filenames in os.walk(folder):
+        for name in sorted(filenames):
+            if not name.endswith('.txt'):
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                written.append(convert_file(path))
+            except ValueError as e:
+                skipped.append((path, str(e)))
+    return written, skipped
@@ -0,0 +1,101 @@
+import math
+
+# the one closest pair implementation shared by the scripts and the gui.
+# hooks are guarded by `tracer is not None` and only pass objects the
+# algorithm already holds, so an untraced run does no extra work per node.
+# the distance function is taken from the tracer per call (Tracer.measure),
+# never patched at module level
+
+
+def distance(p1, p2):
+    return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
+
+
+def brute_force_closest(points, tracer=None):
+    min_dist = float('inf')
+    pair = None
+    n = len(points)
+    measure = distance
+
+    if tracer is not None:
+        tracer.brute_force(points)
+        measure = tracer.measure(distance)
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            dist = measure(points[i], points[j])
+            if dist < min_dist:
+                min_dist = dist
+                pair = (points[i], points[j])
+
+    return min_dist, pair
+
+
+def strip_closest(strip, d, tracer=None):
+    min_dist = d
+    pair = None
+    measure = distance
+    strip.sort(key=lambda p: p.y)
+
+    if tracer is not None:
+        tracer.strip(strip, min_dist)
+        measure = tracer.measure(distance)
+
+    for i in range(len(strip)):
+        j = i + 1
+        while j < len(strip) and (strip[j].y - strip[i].y) < min_dist:
+            dist = measure(strip[i], strip[j])
+            if dist < min_dist:
+                min_dist = dist
+                pair = (strip[i], strip[j])
+            j += 1
+
+    return min_dist, pair
+
+
+def closest_pair_recursive(points_x, points_y, tracer=None):
+    n = len(points_x)
+
+    if n <= 3:
+        return brute_force_closest(points_x, tracer)
+
+    mid = n // 2
+    mid_point = points_x[mid]
+
+    if tracer is not None:
+        tracer.divide(points_x, mid_point)
+
+    points_y_left = [p for p in points_y if p.x <= mid_point.x]
+    points_y_right = [p for p in points_y if p.x > mid_point.x]
+
+    left_dist, left_pair = closest_pair_recursive(points_x[:mid], points_y_left, tracer)
+    right_dist, right_pair = closest_pair_recursive(points_x[mid:], points_y_right, tracer)
+
+    if left_dist < right_dist:
+        min_dist = left_dist
+        min_pair = left_pair
+    else:
+        min_dist = right_dist
+        min_pair = right_pair
+
+    if tracer is not None:
+        tracer.merge(min_dist)
+
+    strip = [p for p in points_y if abs(p.x - mid_point.x) < min_dist]
+
+    if strip:
+        strip_dist, strip_pair = strip_closest(strip, min_dist, tracer)
+        if strip_dist < min_dist:
+            min_dist = strip_dist
+            min_pair = strip_pair
+
+    return min_dist, min_pair
+
+
+def closest_pair(points, tracer=None):
+    if tracer is not None:
+        tracer.start(points)
+
+    points_x = sorted(points, key=lambda p: p.x)
+    points_y = sorted(points, key=lambda p: p.y)
+    return closest_pair_recursive(points_x, points_y, tracer)
@@ -0,0 +1,144 @@
+import heapq
+import math
+
+from dnc.kdtree import KDTree
+
+
+class DynamicClosestPair:
+    # every live point keeps a pointer to a nearest neighbour computed when it
+    # was inserted (or when its old neighbour was deleted), and a heap holds
+    # those neighbour distances. a point inserted later finds its own
+    # neighbour, so the closest pair is always the best live heap entry.
+    #
+    # neighbour queries go to a logarithmic-method forest of static k-d
+    # trees: tree i holds at most 2^i points, an insertion merges the full
+    # low levels into the next free one, and deletions are tombstones that
+    # get compacted once they outnumber the live points
+    def __init__(self, points=()):
+        self.point_of = {}
+        self.xs = {}
+        self.ys = {}
+        self.by_coord = {}
+        self.next_id = 0
+
+        self.trees = []
+        self.dead = set()
+
+        self.nn = {}
+        self.version = {}
+        self.rev = {}
+        self.heap = []
+
+        ids = [self._register(p) for p in points]
+        if ids:
+            self._place(ids, max(0, (len(ids) - 1).bit_length()))
+            for i in ids:
+                self._refresh(i)
+
+    def __len__(self):
+        return len(self.point_of)
+
+    def _register(self, point):
+        i = self.next_id
+        self.next_id += 1
+        self.point_of[i] = point
+        self.xs[i] = point.x
+        self.ys[i] = point.y
+        self.by_coord.setdefault((point.x, point.y), []).append(i)
+        self.version[i] = 0
+        return i
+
+    def _place(self, ids, level):
+        while len(self.trees) <= level:
+            self.trees.append(None)
+        items = [(self.xs[i], self.ys[i], i) for i in ids]
+        self.trees[level] = KDTree.from_items(items)
+
+    def _nearest(self, i):
+        x = self.xs[i]
+        y = self.ys[i]
+        best_d2 = float('inf')
+        best = -1
+        for tree in self.trees:
+            if tree is None:
+                continue
+            d, j = tree.nearest(x, y, skip=i, dead=self.dead)
+            if j >= 0:
+                d2 = (x - self.xs[j])**2 + (y - self.ys[j])**2
+                if d2 < best_d2:
+                    best_d2 = d2
+                    best = j
+        return best_d2, best
+
+    def _refresh(self, i):
+        old = self.nn.get(i)
+        if old in self.rev:
+            self.rev[old].discard(i)
+
+        d2, j = self._nearest(i)
+        self.version[i] += 1
+        if j < 0:
+            self.nn.pop(i, None)
+            return
+
+        self.nn[i] = j
+        self.rev.setdefault(j, set()).add(i)
+        heapq.heappush(self.heap, (d2, i, self.version[i]))
+
+    def insert(self, point):
+        i = self._register(point)
+
+        carry = [i]
+        level = 0
+        while level < len(self.trees) and self.trees[level] is not None:
+            carry.extend(j for j in self.trees[level].ids if j not in self.dead)
+            self.trees[level] = None
+            level += 1
+        self._place(carry, level)
+
+        self._refresh(i)
+
+    def delete(self, point):
+        ids = self.by_coord.get((point.x, point.y))
+        if not ids:
+            raise KeyError(f"{point} is not in the set")
+        i = ids.pop()
+        if not ids:
+            del self.by_coord[(point.x, point.y)]
+
+        del self.point_of[i]
+        self.dead.add(i)
+        self.version[i] += 1
+
+        old = self.nn.pop(i, None)
+        if old in self.rev:
+            self.rev[old].discard(i)
+        for q in self.rev.pop(i, ()):
+            if q in self.point_of:
+                self._refresh(q)
+
+        if len(self.dead) > len(self.point_of):
+            self._compact()
+
+    def _compact(self):
+        live = list(self.point_of)
+        for i in self.dead:
+            del self.xs[i]
+            del self.ys[i]
+            del self.version[i]
+        self.dead = set()
+        self.trees = []
+        if live:
+            self._place(live, max(0, (len(live) - 1).bit_length()))
+        self.heap = [(d2, i, v) for d2, i, v in self.heap
+                     if i in self.point_of and self.version[i] == v]
+        heapq.heapify(self.heap)
+
+    def current_closest(self):
+        heap = self.heap
+        while heap:
+            d2, i, v = heap[0]
+            if i in self.point_of and self.version[i] == v:
+                return math.sqrt(d2), (self.point_of[i], self.point_of[self.nn[i]])
+            heapq.heappop(heap)
+        return float('inf'), None
@@ -0,0 +1,178 @@
+import heapq
+import os
+import resource
+import tempfile
+from array import array
+
+from dnc.closest_pair_indexed import closest_pair_sorted
+
+# rough in-memory cost of one point while a run is being sorted: two float64
+# slots plus the index list and sort keys python needs to order them.
+# the budget sizes the runs, merge buffers and sweep blocks from this
+# estimate. what the call really adds on top of the interpreter is checked
+# by sampling the current RSS after every run and every sweep block
+BYTES_PER_POINT = 128
+MIN_READ_BUFFER = 64
+
+
+def _peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _current_rss_bytes():
+    # resident pages right now (linux); None where /proc is not available
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _MemoryWatch:
+    # tracks how far the current RSS rose above its level at the start of
+    # the call. unlike ru_maxrss this is not masked by an earlier, higher
+    # peak of the process. strict=True turns going over into MemoryError
+    def __init__(self, budget_bytes, strict):
+        self.budget = budget_bytes
+        self.strict = strict
+        self.start = _current_rss_bytes()
+        self.growth = 0
+
+    def sample(self):
+        if self.start is None:
+            return
+        self.growth = max(self.growth, _current_rss_bytes() - self.start)
+        if self.strict and self.growth > self.budget:
+            raise MemoryError(f"external closest pair grew RSS by {self.growth} bytes, "
+                              f"over the budget of {self.budget} bytes")
+
+
+def _write_run(xs, ys, tmpdir):
+    order = sorted(range(len(xs)), key=xs.__getitem__)
+    packed = array('d', bytes(16 * len(order)))
+    for k, i in enumerate(order):
+        packed[2 * k] = xs[i]
+        packed[2 * k + 1] = ys[i]
+    fd, path = tempfile.mkstemp(suffix='.run', dir=tmpdir)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            packed.tofile(f)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _make_runs(filename, run_points, tmpdir, runs, watch):
+    # run files are appended to the caller's list as they are written, so
+    # the caller can remove them even if parsing fails part way
+    count = 0
+    xs = array('d')
+    ys = array('d')
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            x, y = map(float, line.split(','))
+            xs.append(x)
+            ys.append(y)
+            if len(xs) == run_points:
+                runs.append(_write_run(xs, ys, tmpdir))
+                count += len(xs)
+                watch.sample()
+                xs = array('d')
+                ys = array('d')
+    if xs:
+        runs.append(_write_run(xs, ys, tmpdir))
+        count += len(xs)
+        watch.sample()
+    return count
+
+
+def _read_run(path, buffer_points):
+    with open(path, 'rb') as f:
+        while True:
+            block = array('d')
+            try:
+                block.fromfile(f, 2 * buffer_points)
+            except EOFError:
+                pass
+            if not block:
+                return
+            for k in range(0, len(block), 2):
+                yield block[k], block[k + 1]
+
+
+def closest_pair_external(filename, budget_bytes=64 * 1024 * 1024, tmpdir=None,
+                          point_type=None, stats=None, strict=False):
+    run_points = budget_bytes // BYTES_PER_POINT
+    if run_points < 2:
+        raise ValueError(f"memory budget of {budget_bytes} bytes is too small")
+    watch = _MemoryWatch(budget_bytes, strict)
+
+    runs = []
+    try:
+        count = _make_runs(filename, run_points, tmpdir, runs, watch)
+        # the merge holds one read buffer per run plus one block being solved
+        buffer_points = max(MIN_READ_BUFFER, run_points // (2 * max(1, len(runs))))
+        block_points = max(2, run_points // 2)
+        merged = heapq.merge(*[_read_run(path, buffer_points) for path in runs])
+
+        best = float('inf')
+        pair = None
+        carry_x = []
+        carry_y = []
+        block_x = []
+        block_y = []
+
+        def solve():
+            nonlocal best, pair, carry_x, carry_y
+            xs = carry_x + block_x
+            ys = carry_y + block_y
+            d, i, j = closest_pair_sorted(xs, ys, squared=True)
+            if d < best:
+                best = d
+                pair = ((xs[i], ys[i]), (xs[j], ys[j]))
+
+            # the next block can only pair up with points within best of
+            # its left edge, which is at or after the last x seen so far
+            edge = xs[-1] - best
+            k = len(xs)
+            while k > 0 and xs[k - 1] > edge:
+                k -= 1
+            carry_x = xs[k:]
+            carry_y = ys[k:]
+            watch.sample()
+            if len(carry_x) > block_points:
+                raise MemoryError(
+                    f"{len(carry_x)} points lie within the current minimum of the "
+                    f"sweep line, more than the memory budget allows")
+
+        for x, y in merged:
+            block_x.append(x)
+            block_y.append(y)
+            if len(block_x) == block_points:
+                solve()
+                block_x = []
+                block_y = []
+        if block_x:
+            solve()
+    finally:
+        for path in runs:
+            os.remove(path)
+
+    if stats is not None:
+        stats['points'] = count
+        stats['runs'] = len(runs)
+        stats['run_points'] = run_points
+        stats['peak_rss_kb'] = _peak_rss_kb()
+        # None when the current RSS cannot be read on this platform
+        stats['rss_growth_kb'] = watch.growth // 1024 if watch.start is not None else None
+        stats['over_budget'] = watch.start is not None and watch.growth > budget_bytes
+
+    if pair is None:
+        return float('inf'), None
+    if point_type is not None:
+        pair = (point_type(*pair[0]), point_type(*pair[1]))
+    return best, pair
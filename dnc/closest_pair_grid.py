@@ -0,0 +1,72 @@
+import math
+import random
+
+
+def _build_grid(xs, ys, count, cell):
+    grid = {}
+    for k in range(count):
+        key = (math.floor(xs[k] / cell), math.floor(ys[k] / cell))
+        bucket = grid.get(key)
+        if bucket is None:
+            grid[key] = [k]
+        else:
+            bucket.append(k)
+    return grid
+
+
+def closest_pair_grid(points, seed=None):
+    n = len(points)
+    if n < 2:
+        return float('inf'), None
+
+    order = list(range(n))
+    random.Random(seed).shuffle(order)
+    xs = [points[i].x for i in order]
+    ys = [points[i].y for i in order]
+
+    best = (xs[0] - xs[1])**2 + (ys[0] - ys[1])**2
+    pair = (0, 1)
+
+    # randomized incremental (Rabin / Khuller-Matias): keep a hash grid with
+    # cell size = current min distance, so a closer point can only sit in the
+    # 3x3 block around the new point's cell. the grid is rebuilt each time the
+    # minimum shrinks, which happens O(log n) times in expectation on a
+    # random insertion order, giving expected O(n) overall
+    cell = math.sqrt(best)
+    if cell > 0:
+        grid = _build_grid(xs, ys, 2, cell)
+        floor = math.floor
+
+        for k in range(2, n):
+            x = xs[k]
+            y = ys[k]
+            cx = floor(x / cell)
+            cy = floor(y / cell)
+
+            found = False
+            for gx in (cx - 1, cx, cx + 1):
+                for gy in (cy - 1, cy, cy + 1):
+                    bucket = grid.get((gx, gy))
+                    if bucket is None:
+                        continue
+                    for j in bucket:
+                        d2 = (x - xs[j])**2 + (y - ys[j])**2
+                        if d2 < best:
+                            best = d2
+                            pair = (j, k)
+                            found = True
+
+            if found:
+                if best == 0:
+                    break
+                cell = math.sqrt(best)
+                grid = _build_grid(xs, ys, k + 1, cell)
+            else:
+                key = (cx, cy)
+                bucket = grid.get(key)
+                if bucket is None:
+                    grid[key] = [k]
+                else:
+                    bucket.append(k)
+
+    return math.sqrt(best), (points[order[pair[0]]], points[order[pair[1]]])
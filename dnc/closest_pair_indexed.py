@@ -0,0 +1,172 @@
+import math
+
+
+def _sort_range_by_y(ys, buf, lo, hi):
+    for k in range(lo + 1, hi):
+        r = buf[k]
+        m = k - 1
+        while m >= lo and ys[buf[m]] > ys[r]:
+            buf[m + 1] = buf[m]
+            m -= 1
+        buf[m + 1] = r
+
+
+def _brute_force(xs, ys, buf, lo, hi, squared):
+    min_dist = float('inf')
+    bi = bj = -1
+    for i in range(lo, hi):
+        for j in range(i + 1, hi):
+            dx = xs[i] - xs[j]
+            dy = ys[i] - ys[j]
+            dist = dx * dx + dy * dy if squared else math.sqrt(dx**2 + dy**2)
+            if dist < min_dist:
+                min_dist = dist
+                bi, bj = i, j
+
+    # leave the range in y order for the merge one level up
+    _sort_range_by_y(ys, buf, lo, hi)
+    return min_dist, bi, bj
+
+
+def _merge_by_y(ys, buf, aux, lo, mid, hi):
+    a, b, k = lo, mid, lo
+    while a < mid and b < hi:
+        if ys[buf[b]] < ys[buf[a]]:
+            aux[k] = buf[b]
+            b += 1
+        else:
+            aux[k] = buf[a]
+            a += 1
+        k += 1
+    while a < mid:
+        aux[k] = buf[a]
+        a += 1
+        k += 1
+    while b < hi:
+        aux[k] = buf[b]
+        b += 1
+        k += 1
+    for k in range(lo, hi):
+        buf[k] = aux[k]
+
+
+def _strip_closest(xs, ys, strip, lo, end, d, evals):
+    min_dist = d
+    bi = bj = -1
+    count = 0
+    for a in range(lo, end):
+        i = strip[a]
+        b = a + 1
+        while b < end and (ys[strip[b]] - ys[i]) < min_dist:
+            j = strip[b]
+            dist = math.sqrt((xs[i] - xs[j])**2 + (ys[i] - ys[j])**2)
+            count += 1
+            if dist < min_dist:
+                min_dist = dist
+                bi, bj = i, j
+            b += 1
+    evals[0] += count
+    return min_dist, bi, bj
+
+
+def _strip_closest_sq(xs, ys, strip, lo, end, mid, best, evals):
+    # both halves are already known to be >= sqrt(best) apart internally, so
+    # only pairs straddling the mid line can improve, and a d x 2d box holds
+    # at most 8 such points: no more than 7 followers need checking
+    bi = bj = -1
+    count = 0
+    for a in range(lo, end):
+        i = strip[a]
+        xi = xs[i]
+        yi = ys[i]
+        left = i < mid
+        stop = a + 8
+        if stop > end:
+            stop = end
+        for b in range(a + 1, stop):
+            j = strip[b]
+            dy = ys[j] - yi
+            if dy * dy >= best:
+                break
+            if (j < mid) == left:
+                continue
+            dx = xs[j] - xi
+            if dx * dx >= best:
+                continue
+            count += 1
+            d2 = dx * dx + dy * dy
+            if d2 < best:
+                best = d2
+                bi, bj = i, j
+    evals[0] += count
+    return best, bi, bj
+
+
+def _recurse(xs, ys, buf, aux, lo, hi, squared, evals):
+    n = hi - lo
+    if n <= 3:
+        evals[0] += n * (n - 1) // 2
+        return _brute_force(xs, ys, buf, lo, hi, squared)
+
+    mid = (lo + hi) // 2
+    mid_x = xs[mid]
+
+    left = _recurse(xs, ys, buf, aux, lo, mid, squared, evals)
+    right = _recurse(xs, ys, buf, aux, mid, hi, squared, evals)
+    best = left if left[0] < right[0] else right
+    min_dist = math.sqrt(best[0]) if squared else best[0]
+
+    _merge_by_y(ys, buf, aux, lo, mid, hi)
+
+    # aux[lo:hi] is free again after the merge, reuse it for the strip
+    end = lo
+    for k in range(lo, hi):
+        r = buf[k]
+        if -min_dist < xs[r] - mid_x < min_dist:
+            aux[end] = r
+            end += 1
+
+    if end > lo:
+        if squared:
+            strip = _strip_closest_sq(xs, ys, aux, lo, end, mid, best[0], evals)
+        else:
+            strip = _strip_closest(xs, ys, aux, lo, end, min_dist, evals)
+        if strip[0] < best[0]:
+            best = strip
+
+    return best
+
+
+def closest_pair_sorted(xs, ys, squared=False, counts=None):
+    n = len(xs)
+    if n < 2:
+        return float('inf'), -1, -1
+
+    buf = list(range(n))
+    aux = [0] * n
+    evals = [0]
+
+    min_dist, i, j = _recurse(xs, ys, buf, aux, 0, n, squared, evals)
+    if squared:
+        min_dist = math.sqrt(min_dist)
+    if counts is not None:
+        counts['distance_evals'] = counts.get('distance_evals', 0) + evals[0]
+    return min_dist, i, j
+
+
+def closest_pair_indexed(points, squared=False, counts=None):
+    if len(points) < 2:
+        return float('inf'), None
+
+    # everything below works on x-ranks: rank k is the k-th point in x order,
+    # so a subproblem is just its (lo, hi) bounds
+    order = sorted(range(len(points)), key=lambda i: points[i].x)
+    xs = [points[i].x for i in order]
+    ys = [points[i].y for i in order]
+
+    min_dist, i, j = closest_pair_sorted(xs, ys, squared, counts)
+    return min_dist, (points[order[i]], points[order[j]])
+
+
+def closest_pair_squared(points, counts=None):
+    return closest_pair_indexed(points, squared=True, counts=counts)
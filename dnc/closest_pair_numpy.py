@@ -0,0 +1,101 @@
+import math
+import numpy as np
+
+BRUTE_FORCE_SIZE = 32
+
+_upper_pairs = {}
+
+
+def points_to_arrays(points):
+    n = len(points)
+    xs = np.fromiter((p.x for p in points), dtype=np.float64, count=n)
+    ys = np.fromiter((p.y for p in points), dtype=np.float64, count=n)
+    return xs, ys
+
+
+def _pairs_for(n):
+    if n not in _upper_pairs:
+        _upper_pairs[n] = np.triu_indices(n, 1)
+    return _upper_pairs[n]
+
+
+def _brute_force(sx, sy, lo, hi):
+    ii, jj = _pairs_for(hi - lo)
+    bx = sx[lo:hi]
+    by = sy[lo:hi]
+    dx = bx[ii] - bx[jj]
+    dy = by[ii] - by[jj]
+    d2 = dx * dx + dy * dy
+    k = int(np.argmin(d2))
+    return float(d2[k]), lo + int(ii[k]), lo + int(jj[k])
+
+
+def _strip_scan(sx, sy, strip, best):
+    # strip is in y order, so the y-gap to the k-th neighbour only grows with k
+    best_i = best_j = -1
+    tx = sx[strip]
+    ty = sy[strip]
+    m = len(strip)
+    k = 1
+    while k < m:
+        dy = ty[k:] - ty[:-k]
+        gap = dy.min()
+        if gap * gap >= best:
+            break
+        dx = tx[k:] - tx[:-k]
+        d2 = dx * dx + dy * dy
+        t = int(np.argmin(d2))
+        if d2[t] < best:
+            best = float(d2[t])
+            best_i = int(strip[t])
+            best_j = int(strip[t + k])
+        k += 1
+    return best, best_i, best_j
+
+
+def _recurse(sx, sy, lo, hi, iy):
+    n = hi - lo
+    if n <= BRUTE_FORCE_SIZE:
+        return _brute_force(sx, sy, lo, hi)
+
+    mid = lo + n // 2
+    mid_x = sx[mid]
+
+    left_mask = iy < mid
+    left = _recurse(sx, sy, lo, mid, iy[left_mask])
+    right = _recurse(sx, sy, mid, hi, iy[~left_mask])
+    best = left if left[0] < right[0] else right
+
+    d = math.sqrt(best[0])
+    strip = iy[np.abs(sx[iy] - mid_x) < d]
+    if len(strip) > 1:
+        d2, i, j = _strip_scan(sx, sy, strip, best[0])
+        if i >= 0:
+            best = (d2, i, j)
+    return best
+
+
+def closest_pair_xy(xs, ys):
+    xs = np.ascontiguousarray(xs, dtype=np.float64)
+    ys = np.ascontiguousarray(ys, dtype=np.float64)
+    n = len(xs)
+    if n < 2:
+        return float('inf'), None
+
+    # work in x-rank space: rank k is the k-th point in x order, so a
+    # recursion range is just (lo, hi) and the y-partition is a comparison
+    order = np.lexsort((ys, xs))
+    sx = xs[order]
+    sy = ys[order]
+    iy = np.argsort(sy, kind='stable')
+
+    d2, i, j = _recurse(sx, sy, 0, n, iy)
+    return math.sqrt(d2), (int(order[i]), int(order[j]))
+
+
+def closest_pair_numpy(points):
+    xs, ys = points_to_arrays(points)
+    min_dist, idx = closest_pair_xy(xs, ys)
+    if idx is None:
+        return min_dist, None
+    return min_dist, (points[idx[0]], points[idx[1]])
@@ -0,0 +1,100 @@
+import math
+import os
+from bisect import bisect_left, bisect_right
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from dnc.closest_pair_indexed import closest_pair_sorted
+
+MIN_SLAB_SIZE = 1000
+
+
+def _solve_slab(shm_name, n, lo, hi):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        coords = shm.buf.cast('d')
+        xs = coords[lo:hi].tolist()
+        ys = coords[n + lo:n + hi].tolist()
+        coords.release()
+    finally:
+        shm.close()
+
+    min_dist, i, j = closest_pair_sorted(xs, ys, squared=True)
+    return min_dist, lo + i, lo + j
+
+
+def _boundary_strip(xs, ys, boundary, best):
+    # any pair closer than the best found inside the slabs must straddle at
+    # least one slab boundary, and both of its points lie within that
+    # distance of the boundary line
+    d = math.sqrt(best)
+    lo = bisect_left(xs, boundary - d)
+    hi = bisect_right(xs, boundary + d)
+    strip = [k for k in range(lo, hi) if abs(xs[k] - boundary) < d]
+    strip.sort(key=lambda k: ys[k])
+
+    pair = None
+    for a in range(len(strip)):
+        i = strip[a]
+        b = a + 1
+        while b < len(strip) and (ys[strip[b]] - ys[i])**2 < best:
+            j = strip[b]
+            d2 = (xs[i] - xs[j])**2 + (ys[i] - ys[j])**2
+            if d2 < best:
+                best = d2
+                pair = (i, j)
+            b += 1
+    return best, pair
+
+
+def _slab_bounds(n, workers):
+    k = max(1, min(workers, n // MIN_SLAB_SIZE))
+    return [(s * n // k, (s + 1) * n // k) for s in range(k)]
+
+
+def closest_pair_parallel(points, workers=None, executor=None):
+    n = len(points)
+    if n < 2:
+        return float('inf'), None
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    order = sorted(range(n), key=lambda i: points[i].x)
+    xs = [points[i].x for i in order]
+    ys = [points[i].y for i in order]
+
+    slabs = _slab_bounds(n, workers)
+    if len(slabs) == 1:
+        min_dist, i, j = closest_pair_sorted(xs, ys, squared=True)
+        return min_dist, (points[order[i]], points[order[j]])
+
+    shm = shared_memory.SharedMemory(create=True, size=16 * n)
+    try:
+        coords = shm.buf.cast('d')
+        coords[:n] = array('d', xs)
+        coords[n:] = array('d', ys)
+        coords.release()
+
+        pool = executor or ProcessPoolExecutor(max_workers=len(slabs))
+        try:
+            futures = [pool.submit(_solve_slab, shm.name, n, lo, hi) for lo, hi in slabs]
+            results = [f.result() for f in futures]
+        finally:
+            if executor is None:
+                pool.shutdown()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    min_dist, i, j = min(results)
+    best = (xs[i] - xs[j])**2 + (ys[i] - ys[j])**2
+    pair = (i, j)
+
+    for lo, hi in slabs[1:]:
+        best_b, pair_b = _boundary_strip(xs, ys, (xs[lo - 1] + xs[lo]) / 2, best)
+        if pair_b is not None:
+            best = best_b
+            pair = pair_b
+
+    return math.sqrt(best), (points[order[pair[0]]], points[order[pair[1]]])
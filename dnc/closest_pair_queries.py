@@ -0,0 +1,160 @@
+import heapq
+import math
+from bisect import bisect_left
+
+from dnc.closest_pair_indexed import _merge_by_y, _sort_range_by_y
+
+
+def _sorted_coords(points):
+    order = sorted(range(len(points)), key=lambda i: points[i].x)
+    xs = [points[i].x for i in order]
+    ys = [points[i].y for i in order]
+    return order, xs, ys
+
+
+# ---- k closest pairs ----
+#
+# same recursion as closest_pair_indexed, but the strip width is the k-th
+# best squared distance seen so far (kept in a size-k max-heap) instead of
+# the single best. pairs inside one half were already offered to the heap
+# while its bound was at least as loose as now, so the strip only needs to
+# look at pairs that straddle the mid line
+
+def _offer(heap, k, d2, i, j):
+    if len(heap) < k:
+        heapq.heappush(heap, (-d2, i, j))
+    elif d2 < -heap[0][0]:
+        heapq.heapreplace(heap, (-d2, i, j))
+
+
+def _bound(heap, k):
+    return -heap[0][0] if len(heap) == k else float('inf')
+
+
+def _k_recurse(xs, ys, buf, aux, lo, hi, heap, k):
+    if hi - lo <= 3:
+        for i in range(lo, hi):
+            for j in range(i + 1, hi):
+                _offer(heap, k, (xs[i] - xs[j])**2 + (ys[i] - ys[j])**2, i, j)
+        _sort_range_by_y(ys, buf, lo, hi)
+        return
+
+    mid = (lo + hi) // 2
+    mid_x = xs[mid]
+    _k_recurse(xs, ys, buf, aux, lo, mid, heap, k)
+    _k_recurse(xs, ys, buf, aux, mid, hi, heap, k)
+    _merge_by_y(ys, buf, aux, lo, mid, hi)
+
+    bound = _bound(heap, k)
+    end = lo
+    for t in range(lo, hi):
+        r = buf[t]
+        if (xs[r] - mid_x)**2 < bound:
+            aux[end] = r
+            end += 1
+
+    for a in range(lo, end):
+        i = aux[a]
+        left = i < mid
+        b = a + 1
+        while b < end and (ys[aux[b]] - ys[i])**2 < bound:
+            j = aux[b]
+            if (j < mid) != left:
+                d2 = (xs[i] - xs[j])**2 + (ys[i] - ys[j])**2
+                if d2 < bound:
+                    _offer(heap, k, d2, i, j)
+                    bound = _bound(heap, k)
+            b += 1
+
+
+def k_closest_pairs(points, k):
+    n = len(points)
+    k = min(k, n * (n - 1) // 2)
+    if k <= 0:
+        return []
+
+    order, xs, ys = _sorted_coords(points)
+    buf = list(range(n))
+    aux = [0] * n
+    heap = []
+    _k_recurse(xs, ys, buf, aux, 0, n, heap, k)
+
+    result = sorted((-neg, i, j) for neg, i, j in heap)
+    return [(math.sqrt(d2), (points[order[i]], points[order[j]])) for d2, i, j in result]
+
+
+# ---- all nearest neighbours ----
+#
+# each point carries its best squared distance so far. after both halves are
+# solved, a point can only improve across the mid line if it is closer to
+# the line than to its current neighbour, and then only against points of
+# the other half inside its own y-window
+
+def _cross_scan(xs, ys, cand, other, other_ys, nd2, nn):
+    for i in cand:
+        r2 = nd2[i]
+        r = math.sqrt(r2)
+        b = bisect_left(other_ys, ys[i] - r)
+        while b < len(other) and other_ys[b] < ys[i] + r:
+            j = other[b]
+            d2 = (xs[i] - xs[j])**2 + (ys[i] - ys[j])**2
+            if d2 < nd2[i]:
+                nd2[i] = d2
+                nn[i] = j
+            if d2 < nd2[j]:
+                nd2[j] = d2
+                nn[j] = i
+            b += 1
+
+
+def _nn_recurse(xs, ys, buf, aux, lo, hi, nd2, nn):
+    if hi - lo <= 3:
+        for i in range(lo, hi):
+            for j in range(i + 1, hi):
+                d2 = (xs[i] - xs[j])**2 + (ys[i] - ys[j])**2
+                if d2 < nd2[i]:
+                    nd2[i] = d2
+                    nn[i] = j
+                if d2 < nd2[j]:
+                    nd2[j] = d2
+                    nn[j] = i
+        _sort_range_by_y(ys, buf, lo, hi)
+        return
+
+    mid = (lo + hi) // 2
+    mid_x = xs[mid]
+    _nn_recurse(xs, ys, buf, aux, lo, mid, nd2, nn)
+    _nn_recurse(xs, ys, buf, aux, mid, hi, nd2, nn)
+
+    # both halves are still in y order here, before the merge
+    left = [i for i in buf[lo:mid] if (mid_x - xs[i])**2 < nd2[i]]
+    right = [j for j in buf[mid:hi] if (xs[j] - mid_x)**2 < nd2[j]]
+
+    if left:
+        reach = max(math.sqrt(nd2[i]) for i in left)
+        other = [j for j in buf[mid:hi] if xs[j] - mid_x < reach]
+        _cross_scan(xs, ys, left, other, [ys[j] for j in other], nd2, nn)
+    if right:
+        reach = max(math.sqrt(nd2[j]) for j in right)
+        other = [i for i in buf[lo:mid] if mid_x - xs[i] < reach]
+        _cross_scan(xs, ys, right, other, [ys[i] for i in other], nd2, nn)
+
+    _merge_by_y(ys, buf, aux, lo, mid, hi)
+
+
+def all_nearest_neighbors(points):
+    n = len(points)
+    if n < 2:
+        return [(float('inf'), None) for _ in points]
+
+    order, xs, ys = _sorted_coords(points)
+    buf = list(range(n))
+    aux = [0] * n
+    nd2 = [float('inf')] * n
+    nn = [-1] * n
+    _nn_recurse(xs, ys, buf, aux, 0, n, nd2, nn)
+
+    result = [None] * n
+    for r in range(n):
+        result[order[r]] = (math.sqrt(nd2[r]), points[order[nn[r]]])
+    return result
@@ -0,0 +1,78 @@
+from array import array
+
+# files are read in blocks of about this size, each extended to the next
+# newline so no line is split between two blocks
+CHUNK_BYTES = 1 << 24
+
+# every byte except ',' and '\n', for stripping a block down to its separators
+_NOT_SEPARATOR = bytes(b for b in range(256) if b not in b',\n')
+
+
+def _parse_lines(chunk, first_line, filename, xs, ys):
+    # slow path: one line at a time, skipping blank lines, and reporting the
+    # exact line and column of the first malformed value
+    for k, line in enumerate(chunk.split(b'\n')):
+        if not line.strip():
+            continue
+        lineno = first_line + k
+        parts = line.split(b',')
+        if len(parts) != 2:
+            raise ValueError(f"{filename}:{lineno}: expected 'x,y', got {line.decode(errors='replace')!r}")
+        col = 1
+        values = []
+        for part in parts:
+            try:
+                values.append(float(part))
+            except ValueError:
+                raise ValueError(
+                    f"{filename}:{lineno}:{col}: not a number: {part.decode(errors='replace')!r}") from None
+            col += len(part) + 1
+        xs.append(values[0])
+        ys.append(values[1])
+
+
+def parse_points(chunk, xs, ys, filename='<data>', first_line=1):
+    # fast path: turn every newline into a comma and hand the whole block to
+    # float() in one map, so there is no per-line python work at all. any
+    # irregularity (blank lines, wrong field counts, bad numbers) falls back
+    # to the line-by-line parser, which also finds the error position.
+    # the token count alone is not enough: a line with an extra field and
+    # one with a missing field cancel out, so the separators must also
+    # alternate comma, newline, comma, ... (one comma on every line)
+    body = chunk.rstrip(b'\r\n \t')
+    if not body:
+        return
+    lines = body.count(b'\n') + 1
+    values = body.replace(b'\n', b',').split(b',')
+    if len(values) == 2 * lines and body.translate(None, _NOT_SEPARATOR) == b',\n' * (lines - 1) + b',':
+        try:
+            coords = array('d', map(float, values))
+        except ValueError:
+            coords = None
+        if coords is not None:
+            xs.extend(coords[0::2])
+            ys.extend(coords[1::2])
+            return
+    _parse_lines(chunk, first_line, filename, xs, ys)
+
+
+def read_points_csv(filename, chunk_bytes=CHUNK_BYTES):
+    xs = array('d')
+    ys = array('d')
+    line = 1
+    with open(filename, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                break
+            if not chunk.endswith(b'\n'):
+                chunk += f.readline()
+            parse_points(chunk, xs, ys, filename, line)
+            line += chunk.count(b'\n')
+    return xs, ys
+
+
+def load_points_csv(filename, point_type, chunk_bytes=CHUNK_BYTES):
+    xs, ys = read_points_csv(filename, chunk_bytes)
+    return list(map(point_type, xs, ys))
+
@@ -0,0 +1,80 @@
+import decimal
+import math
+
+# CPython's int <-> str conversions are quadratic in the number of digits.
+# both directions below split the number in half and recurse, so the cost is
+# dominated by a few big multiplications instead:
+#   str -> int: int(high) * 10^k + int(low), with karatsuba int products
+#   int -> str: rebuild the int as a Decimal from binary halves; libmpdec
+#               multiplies huge Decimals with a number-theoretic transform
+#               and prints them in linear time
+# below these sizes the builtins are faster
+STR_TO_INT_CUTOFF = 3000
+INT_TO_STR_CUTOFF_BITS = 8192
+DIGIT_COUNT_STR_BITS = 256
+
+_pow10 = {}
+_pow2 = {}
+
+
+def _power_of_ten(k):
+    if k not in _pow10:
+        _pow10[k] = 10 ** k
+    return _pow10[k]
+
+
+def _str_to_int(s):
+    if len(s) <= STR_TO_INT_CUTOFF:
+        return int(s)
+    k = len(s) // 2
+    return _str_to_int(s[:-k]) * _power_of_ten(k) + _str_to_int(s[-k:])
+
+
+def str_to_int(s):
+    s = s.strip()
+    if s[:1] in ('-', '+'):
+        value = _str_to_int(s[1:])
+        return -value if s[0] == '-' else value
+    return _str_to_int(s)
+
+
+def _to_decimal(n, bits):
+    if bits <= INT_TO_STR_CUTOFF_BITS:
+        return decimal.Decimal(n)
+    half = bits >> 1
+    high = n >> half
+    low = n - (high << half)
+    if half not in _pow2:
+        _pow2[half] = decimal.Decimal(2) ** half
+    return _to_decimal(high, bits - half) * _pow2[half] + _to_decimal(low, half)
+
+
+def int_to_str(n):
+    bits = n.bit_length()
+    if bits <= INT_TO_STR_CUTOFF_BITS:
+        return str(n)
+    with decimal.localcontext() as ctx:
+        ctx.prec = decimal.MAX_PREC
+        ctx.Emax = decimal.MAX_EMAX
+        ctx.traps[decimal.Inexact] = True
+        text = str(_to_decimal(abs(n), bits))
+    return '-' + text if n < 0 else text
+
+
+def digit_count(n):
+    # number of decimal digits of n without printing it. math.log10 of a big
+    # int rounds a few times (frexp of n, then log10(m) + e*log10(2)), so its
+    # absolute error grows with the result: a few ulps, ~2e-9 per ulp at 10^7
+    # digits. only a log that close to an integer is settled exactly, by
+    # comparing with the power of ten; small values just use str()
+    n = abs(n)
+    if n.bit_length() <= DIGIT_COUNT_STR_BITS:
+        return len(str(n))
+    log = math.log10(n)
+    k = math.floor(log)
+    tol = log * 2.0 ** -48
+    if log - k < tol:
+        return k + 1 if n >= _power_of_ten(k) else k
+    if k + 1 - log < tol:
+        return k + 2 if n >= _power_of_ten(k + 1) else k + 1
+    return k + 1
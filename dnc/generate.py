@@ -0,0 +1,117 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dnc.binary_io import POINTS_EXT, write_points_arrays
+
+# points are produced in fixed-size chunks, each with its own stream spawned
+# from the seed, so a file's contents depend only on (seed, n, distribution)
+# and not on how many workers wrote it
+CHUNK_POINTS = 1 << 20
+DISTRIBUTIONS = ['uniform', 'clustered', 'gridded', 'duplicates', 'collinear']
+
+CLUSTERS = 32
+CLUSTER_SPREAD = 0.01
+DUPLICATES_PER_CELL = 4
+
+
+def _chunk_rng(seed, k):
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(k,)))
+
+
+def _cluster_centers(seed, max_coord):
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(2**32,)))
+    return rng.uniform(0, max_coord, size=(CLUSTERS, 2))
+
+
+def _chunk(n, distribution, seed, max_coord, k):
+    # points [k * CHUNK_POINTS, min(n, (k + 1) * CHUNK_POINTS))
+    lo = k * CHUNK_POINTS
+    m = min(n, lo + CHUNK_POINTS) - lo
+    rng = _chunk_rng(seed, k)
+
+    if distribution == 'uniform':
+        xs = rng.uniform(0, max_coord, m)
+        ys = rng.uniform(0, max_coord, m)
+    elif distribution == 'clustered':
+        # gaussian blobs around a few centres: dense strips, many close pairs
+        centers = _cluster_centers(seed, max_coord)
+        which = rng.integers(0, CLUSTERS, m)
+        spread = CLUSTER_SPREAD * max_coord
+        xs = centers[which, 0] + rng.normal(0, spread, m)
+        ys = centers[which, 1] + rng.normal(0, spread, m)
+    elif distribution == 'gridded':
+        # a square lattice filled row by row: every neighbour is a tie
+        side = int(np.ceil(np.sqrt(n)))
+        idx = np.arange(lo, lo + m)
+        step = max_coord / side
+        xs = (idx % side) * step
+        ys = (idx // side) * step
+    elif distribution == 'duplicates':
+        # uniform points snapped to a coarse lattice, so most points share
+        # their exact coordinates with a few others
+        side = max(1, int(np.sqrt(n / DUPLICATES_PER_CELL)))
+        step = max_coord / side
+        xs = rng.integers(0, side, m) * step
+        ys = rng.integers(0, side, m) * step
+    elif distribution == 'collinear':
+        # one vertical line: every point lands in the strip at every level
+        xs = np.full(m, max_coord / 2)
+        ys = rng.uniform(0, max_coord, m)
+    else:
+        raise ValueError(f"unknown distribution: {distribution}")
+    return xs.astype(np.float64), ys.astype(np.float64)
+
+
+def generate_points(n, distribution='uniform', seed=None, max_coord=10000.0):
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    chunks = [_chunk(n, distribution, seed, max_coord, k)
+              for k in range(-(-n // CHUNK_POINTS))]
+    if not chunks:
+        return np.empty(0), np.empty(0)
+    return np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks])
+
+
+def _chunk_text(n, distribution, seed, max_coord, k):
+    xs, ys = _chunk(n, distribution, seed, max_coord, k)
+    # repr-formatted like save_closest_pair_to_file, built as one string
+    return ''.join([f"{x},{y}\n" for x, y in zip(xs.tolist(), ys.tolist())])
+
+
+def write_points_file(filename, n, distribution='uniform', seed=None, max_coord=10000.0,
+                      workers=1):
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    if filename.endswith(POINTS_EXT):
+        xs, ys = generate_points(n, distribution, seed, max_coord)
+        write_points_arrays(filename, xs, ys)
+        return seed
+
+    chunks = range(-(-n // CHUNK_POINTS))
+    with open(filename, 'w') as f:
+        if workers <= 1 or len(chunks) <= 1:
+            for k in chunks:
+                f.write(_chunk_text(n, distribution, seed, max_coord, k))
+        else:
+            # map keeps chunk order, so the file is the same as a serial run
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                args = [(n, distribution, seed, max_coord, k) for k in chunks]
+                for text in pool.map(_chunk_text, *zip(*args)):
+                    f.write(text)
+    return seed
+
+
+def generate_files(jobs, workers=None):
+    # jobs: (filename, n, distribution, seed) tuples, one file per worker
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for filename, n, distribution, seed in jobs:
+            write_points_file(filename, n, distribution, seed)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write_points_file, *job) for job in jobs]
+        for f in futures:
+            f.result()
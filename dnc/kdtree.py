@@ -0,0 +1,162 @@
+import math
+import os
+import struct
+from array import array
+
+LEAF_SIZE = 8
+
+# file layout: header, then xs, ys, splits (float64) and ids (int64) in tree
+# order. the header's pair ids are -1 until closest_pair() has been computed
+_MAGIC = b'KDT1'
+_HEADER = struct.Struct('<4sqqqqd')
+
+
+class KDTree:
+    # implicit balanced tree over flat arrays: the node for range [lo, hi)
+    # splits at mid = (lo + hi) // 2 on x at even depth and y at odd depth,
+    # with [lo, mid) on the low side and [mid, hi) on the high side. no two
+    # internal nodes share a mid, so splits[mid] holds the node's split value.
+    # ranges of LEAF_SIZE or fewer points are scanned linearly
+    def __init__(self, xs, ys, splits, ids, leaf_size=LEAF_SIZE):
+        self.xs = xs
+        self.ys = ys
+        self.splits = splits
+        self.ids = ids
+        self.leaf_size = leaf_size
+        self.pair = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, points, leaf_size=LEAF_SIZE):
+        return cls.from_items([(p.x, p.y, i) for i, p in enumerate(points)], leaf_size)
+
+    @classmethod
+    def from_items(cls, items, leaf_size=LEAF_SIZE):
+        splits = array('d', bytes(8 * len(items)))
+        cls._arrange(items, splits, 0, len(items), 0, leaf_size)
+        xs = array('d', [t[0] for t in items])
+        ys = array('d', [t[1] for t in items])
+        ids = array('q', [t[2] for t in items])
+        return cls(xs, ys, splits, ids, leaf_size)
+
+    @classmethod
+    def _arrange(cls, items, splits, lo, hi, depth, leaf_size):
+        if hi - lo <= leaf_size:
+            return
+        axis = depth % 2
+        items[lo:hi] = sorted(items[lo:hi], key=lambda t: t[axis])
+        mid = (lo + hi) // 2
+        splits[mid] = items[mid][axis]
+        cls._arrange(items, splits, lo, mid, depth + 1, leaf_size)
+        cls._arrange(items, splits, mid, hi, depth + 1, leaf_size)
+
+    def _nearest(self, x, y, lo, hi, depth, skip, dead, best):
+        xs, ys, ids = self.xs, self.ys, self.ids
+        if hi - lo <= self.leaf_size:
+            for k in range(lo, hi):
+                if ids[k] == skip or (dead and ids[k] in dead):
+                    continue
+                d2 = (xs[k] - x)**2 + (ys[k] - y)**2
+                if d2 < best[0]:
+                    best[0] = d2
+                    best[1] = k
+            return
+
+        mid = (lo + hi) // 2
+        gap = (x if depth % 2 == 0 else y) - self.splits[mid]
+        if gap < 0:
+            self._nearest(x, y, lo, mid, depth + 1, skip, dead, best)
+            if gap * gap < best[0]:
+                self._nearest(x, y, mid, hi, depth + 1, skip, dead, best)
+        else:
+            self._nearest(x, y, mid, hi, depth + 1, skip, dead, best)
+            if gap * gap < best[0]:
+                self._nearest(x, y, lo, mid, depth + 1, skip, dead, best)
+
+    def nearest(self, x, y, skip=-1, dead=None):
+        best = [float('inf'), -1]
+        self._nearest(x, y, 0, len(self.ids), 0, skip, dead, best)
+        if best[1] < 0:
+            return float('inf'), -1
+        return math.sqrt(best[0]), self.ids[best[1]]
+
+    def _radius(self, x, y, r2, lo, hi, depth, out):
+        xs, ys = self.xs, self.ys
+        if hi - lo <= self.leaf_size:
+            for k in range(lo, hi):
+                if (xs[k] - x)**2 + (ys[k] - y)**2 <= r2:
+                    out.append(self.ids[k])
+            return
+
+        mid = (lo + hi) // 2
+        gap = (x if depth % 2 == 0 else y) - self.splits[mid]
+        if gap < 0 or gap * gap <= r2:
+            self._radius(x, y, r2, lo, mid, depth + 1, out)
+        if gap >= 0 or gap * gap <= r2:
+            self._radius(x, y, r2, mid, hi, depth + 1, out)
+
+    def within(self, x, y, r):
+        out = []
+        self._radius(x, y, r * r, 0, len(self.ids), 0, out)
+        return out
+
+    def closest_pair(self):
+        if self.pair is None:
+            n = len(self.ids)
+            best = [float('inf'), -1, -1]
+            for k in range(n):
+                d, j = self.nearest(self.xs[k], self.ys[k], skip=self.ids[k])
+                if d < best[0]:
+                    best = [d, self.ids[k], j]
+            self.pair = (best[0], best[1], best[2])
+        return self.pair
+
+    def save(self, filename):
+        d, i, j = self.pair if self.pair is not None else (float('inf'), -1, -1)
+        with open(filename, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, len(self.ids), self.leaf_size, i, j, d))
+            self.xs.tofile(f)
+            self.ys.tofile(f)
+            self.splits.tofile(f)
+            self.ids.tofile(f)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as f:
+            magic, n, leaf_size, i, j, d = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{filename} is not a k-d tree index")
+            xs = array('d')
+            ys = array('d')
+            splits = array('d')
+            ids = array('q')
+            xs.fromfile(f, n)
+            ys.fromfile(f, n)
+            splits.fromfile(f, n)
+            ids.fromfile(f, n)
+        tree = cls(xs, ys, splits, ids, leaf_size)
+        if i >= 0:
+            tree.pair = (d, i, j)
+        return tree
+
+
+def index_path(dataset_path):
+    return dataset_path + '.kdt'
+
+
+def load_or_build_index(points, dataset_path):
+    path = index_path(dataset_path)
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(dataset_path):
+        try:
+            tree = KDTree.load(path)
+            if len(tree) == len(points):
+                return tree
+        except (ValueError, EOFError, struct.error):
+            pass
+
+    tree = KDTree.build(points)
+    tree.closest_pair()
+    tree.save(path)
+    return tree
@@ -0,0 +1,305 @@
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+
+from dnc.decimal_io import digit_count
+
+# below this many bits per operand another level of python recursion costs
+# more than it saves over CPython's own multiply (measured on 2k-1M digit
+# operands: 2048 bits was ~30% slower than native at 20k digits, 65536 bits
+# within a few percent of it up to 1M digits)
+KARATSUBA_THRESHOLD_BITS = 65536
+TOOM3_MIN_BITS = 64
+
+
+def karatsuba_multiply(x, y, tracer=None, depth=0):
+    # the textbook base-10 version shared by the scripts and the gui; the
+    # hooks only run with a tracer attached (see dnc.trace)
+    if x < 10 or y < 10:
+        result = x * y
+        if tracer is not None:
+            tracer.karatsuba_base(x, y, result, depth)
+        return result
+
+    # both are >= 10 here, so the larger one has the most digits; digit_count
+    # never prints the operand (str() refuses ints past 4300 digits)
+    n = digit_count(max(x, y))
+    half = n // 2
+    power = 10 ** half
+
+    high1 = x // power
+    low1 = x % power
+    high2 = y // power
+    low2 = y % power
+
+    if tracer is not None:
+        tracer.karatsuba_split(x, y, half, depth)
+        depth += 1
+
+    z0 = karatsuba_multiply(low1, low2, tracer, depth)
+    z1 = karatsuba_multiply(low1 + high1, low2 + high2, tracer, depth)
+    z2 = karatsuba_multiply(high1, high2, tracer, depth)
+
+    result = z2 * (10 ** (2 * half)) + (z1 - z2 - z0) * power + z0
+
+    if tracer is not None:
+        tracer.karatsuba_combine(x, y, result, depth - 1)
+
+    return result
+
+
+def karatsuba_binary(x, y, threshold=KARATSUBA_THRESHOLD_BITS):
+    n = max(x.bit_length(), y.bit_length())
+    if n <= threshold:
+        return x * y
+
+    half = n // 2
+    mask = (1 << half) - 1
+
+    high1 = x >> half
+    low1 = x & mask
+    high2 = y >> half
+    low2 = y & mask
+
+    z0 = karatsuba_binary(low1, low2, threshold)
+    z1 = karatsuba_binary(low1 + high1, low2 + high2, threshold)
+    z2 = karatsuba_binary(high1, high2, threshold)
+
+    return (z2 << (2 * half)) + ((z1 - z2 - z0) << half) + z0
+
+
+def _karatsuba_step(x, y, mul):
+    n = max(x.bit_length(), y.bit_length())
+    half = n // 2
+    mask = (1 << half) - 1
+
+    high1 = x >> half
+    low1 = x & mask
+    high2 = y >> half
+    low2 = y & mask
+
+    z0 = mul(low1, low2)
+    z1 = mul(low1 + high1, low2 + high2)
+    z2 = mul(high1, high2)
+
+    return (z2 << (2 * half)) + ((z1 - z2 - z0) << half) + z0
+
+
+def _signed_mul(mul, a, b):
+    if (a < 0) != (b < 0):
+        return -mul(abs(a), abs(b))
+    return mul(abs(a), abs(b))
+
+
+def _toom3_step(x, y, mul):
+    # split into three k-bit limbs, evaluate at 0, 1, -1, -2 and infinity,
+    # then interpolate with Bodrato's sequence (all divisions are exact)
+    if x < 0 or y < 0:
+        return _signed_mul(lambda a, b: _toom3_step(a, b, mul), x, y)
+
+    n = max(x.bit_length(), y.bit_length())
+    k = (n + 2) // 3
+    mask = (1 << k) - 1
+
+    x0, x1, x2 = x & mask, (x >> k) & mask, x >> (2 * k)
+    y0, y1, y2 = y & mask, (y >> k) & mask, y >> (2 * k)
+
+    p = x0 + x2
+    q = y0 + y2
+    p1, pm1 = p + x1, p - x1
+    q1, qm1 = q + y1, q - y1
+    pm2 = ((pm1 + x2) << 1) - x0
+    qm2 = ((qm1 + y2) << 1) - y0
+
+    r0 = mul(x0, y0)
+    r1 = mul(p1, q1)
+    rm1 = _signed_mul(mul, pm1, qm1)
+    rm2 = _signed_mul(mul, pm2, qm2)
+    rinf = mul(x2, y2)
+
+    c3 = (rm2 - r1) // 3
+    c1 = (r1 - rm1) >> 1
+    c2 = rm1 - r0
+    c3 = ((c2 - c3) >> 1) + (rinf << 1)
+    c2 = c2 + c1 - rinf
+    c1 = c1 - c3
+
+    return r0 + (c1 << k) + (c2 << (2 * k)) + (c3 << (3 * k)) + (rinf << (4 * k))
+
+
+def toom3_multiply(x, y, threshold=KARATSUBA_THRESHOLD_BITS):
+    # evaluation at -2 adds a few bits to each limb, so tiny operands would
+    # never shrink; TOOM3_MIN_BITS keeps the recursion well-founded
+    if max(x.bit_length(), y.bit_length()) <= max(threshold, TOOM3_MIN_BITS):
+        return x * y
+    return _toom3_step(x, y, lambda a, b: toom3_multiply(a, b, threshold))
+
+
+# ---- unbalanced operands ----
+#
+# splitting both operands at half the longer one wastes the short operand's
+# (all-zero) high half at every level. instead, cut the long operand into
+# pieces the size of the short one, multiply piece by piece and add the
+# shifted partial products back up in a balanced tree
+
+UNBALANCED_RATIO = 2
+# the pieces are multiplied by a karatsuba that recurses from this size, not
+# from KARATSUBA_THRESHOLD_BITS: at that cutoff every piece up to ~33k bits
+# would go straight to native x*y and the chunking would change nothing
+UNBALANCED_THRESHOLD_BITS = 1024
+
+
+def _chunked(x, y, chunk, mul):
+    pieces = -(-x.bit_length() // chunk)
+    if pieces <= 1:
+        return mul(x, y)
+    half = (pieces // 2) * chunk
+    high = _chunked(x >> half, y, chunk, mul)
+    low = _chunked(x & ((1 << half) - 1), y, chunk, mul)
+    return (high << half) + low
+
+
+def unbalanced_multiply(x, y, mul=None):
+    if mul is None:
+        mul = lambda a, b: karatsuba_binary(a, b, UNBALANCED_THRESHOLD_BITS)
+    if (x < 0) != (y < 0):
+        return -unbalanced_multiply(abs(x), abs(y), mul)
+    x, y = abs(x), abs(y)
+    if x.bit_length() < y.bit_length():
+        x, y = y, x
+
+    short = y.bit_length()
+    if short == 0 or x.bit_length() < UNBALANCED_RATIO * short:
+        return mul(x, y)
+    return _chunked(x, y, short, mul)
+
+
+# ---- size-based dispatcher ----
+#
+# thresholds are the operand sizes (in bits) from which one more python level
+# of karatsuba / toom-3 beats handing the whole product to the next cheaper
+# method. they depend on the host and interpreter, so they are measured once
+# and cached in THRESHOLDS_FILE; None means "never worth it here"
+
+THRESHOLDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                               'multiply_thresholds.json')
+CALIBRATION_BITS = [2**k for k in range(10, 21)]
+# a method has to win by this factor to count, so timer noise on a busy host
+# does not flip a threshold
+CALIBRATION_MARGIN = 0.95
+
+_thresholds = None
+
+
+def _native(x, y):
+    return x * y
+
+
+def _best_time(fn, x, y, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(x, y)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _crossover(timings, algo, others):
+    # smallest size from which algo stays ahead of every alternative
+    crossover = None
+    for row in reversed(timings):
+        if any(row[algo] >= CALIBRATION_MARGIN * row[o] for o in others):
+            break
+        crossover = row['bits']
+    return crossover
+
+
+def calibrate_thresholds(bit_sizes=CALIBRATION_BITS, repeats=5):
+    rng = random.Random(0)
+    timings = []
+    for bits in bit_sizes:
+        x = rng.getrandbits(bits) | (1 << (bits - 1))
+        y = rng.getrandbits(bits) | (1 << (bits - 1))
+        timings.append({
+            'bits': bits,
+            'native': _best_time(_native, x, y, repeats),
+            'karatsuba': _best_time(lambda a, b: _karatsuba_step(a, b, _native), x, y, repeats),
+            'toom3': _best_time(lambda a, b: _toom3_step(a, b, _native), x, y, repeats)
+        })
+
+    return {
+        'host': platform.node(),
+        'python': platform.python_version(),
+        'karatsuba': _crossover(timings, 'karatsuba', ['native']),
+        'toom3': _crossover(timings, 'toom3', ['native', 'karatsuba']),
+        'timings': timings
+    }
+
+
+def _read_cached(path):
+    # None when the cache is missing, unreadable or for another host
+    try:
+        with open(path, 'r') as f:
+            cached = json.load(f)
+        if cached['host'] != platform.node() or cached['python'] != platform.python_version():
+            return None
+        for key in ('karatsuba', 'toom3'):
+            if cached[key] is not None and not isinstance(cached[key], int):
+                return None
+        return cached
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def load_thresholds(path=THRESHOLDS_FILE, recalibrate=False):
+    if not recalibrate:
+        cached = _read_cached(path)
+        if cached is not None:
+            return cached
+
+    thresholds = calibrate_thresholds()
+    # write next to the target and rename over it, so a crash or a second
+    # process never leaves a half-written cache behind
+    fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(thresholds, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return thresholds
+
+
+def get_thresholds():
+    global _thresholds
+    if _thresholds is None:
+        _thresholds = load_thresholds()
+    return _thresholds
+
+
+def choose_method(bits, thresholds):
+    if bits <= TOOM3_MIN_BITS:
+        return 'native'
+    if thresholds['toom3'] is not None and bits >= thresholds['toom3']:
+        return 'toom3'
+    if thresholds['karatsuba'] is not None and bits >= thresholds['karatsuba']:
+        return 'karatsuba'
+    return 'native'
+
+
+def hybrid_multiply(x, y, thresholds=None):
+    if thresholds is None:
+        thresholds = get_thresholds()
+
+    method = choose_method(max(x.bit_length(), y.bit_length()), thresholds)
+    if method == 'native':
+        return x * y
+
+    mul = lambda a, b: hybrid_multiply(a, b, thresholds)
+    if method == 'toom3':
+        return _toom3_step(x, y, mul)
+    return _karatsuba_step(x, y, mul)
@@ -0,0 +1,69 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from dnc.multiply import karatsuba_binary, KARATSUBA_THRESHOLD_BITS
+
+# below this many bits per operand, shipping the operands to another process
+# costs more than the product itself
+PARALLEL_MIN_BITS = 1 << 20
+
+
+def _leaf(x, y, threshold):
+    return karatsuba_binary(x, y, threshold)
+
+
+def _expand(x, y, levels, tasks, min_bits):
+    # unroll the top karatsuba levels into a tree whose leaves are the
+    # independent sub-products (3 per level); leaves are indexes into tasks
+    n = max(x.bit_length(), y.bit_length())
+    if levels == 0 or n <= min_bits:
+        tasks.append((x, y))
+        return len(tasks) - 1
+
+    half = n // 2
+    mask = (1 << half) - 1
+    high1, low1 = x >> half, x & mask
+    high2, low2 = y >> half, y & mask
+
+    z0 = _expand(low1, low2, levels - 1, tasks, min_bits)
+    z1 = _expand(low1 + high1, low2 + high2, levels - 1, tasks, min_bits)
+    z2 = _expand(high1, high2, levels - 1, tasks, min_bits)
+    return (half, z0, z1, z2)
+
+
+def _combine(node, products):
+    if isinstance(node, int):
+        return products[node]
+    half, z0, z1, z2 = node
+    z0 = _combine(z0, products)
+    z1 = _combine(z1, products)
+    z2 = _combine(z2, products)
+    return (z2 << (2 * half)) + ((z1 - z2 - z0) << half) + z0
+
+
+def default_levels(workers):
+    # one level gives 3 sub-products, two give 9
+    return 1 if workers <= 3 else 2
+
+
+def parallel_karatsuba(x, y, workers=None, levels=None, threshold=KARATSUBA_THRESHOLD_BITS,
+                       executor=None, min_bits=PARALLEL_MIN_BITS):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if levels is None:
+        levels = default_levels(workers)
+
+    tasks = []
+    root = _expand(x, y, levels, tasks, min_bits)
+    if workers <= 1 or len(tasks) == 1:
+        products = [karatsuba_binary(a, b, threshold) for a, b in tasks]
+        return _combine(root, products)
+
+    pool = executor or ProcessPoolExecutor(max_workers=min(workers, len(tasks)))
+    try:
+        futures = [pool.submit(_leaf, a, b, threshold) for a, b in tasks]
+        products = [f.result() for f in futures]
+    finally:
+        if executor is None:
+            pool.shutdown()
+    return _combine(root, products)
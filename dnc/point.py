@@ -0,0 +1,9 @@
+class Point:
+    __slots__ = ('x', 'y')
+    
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+    
+    def __repr__(self):
+        return f"({self.x:.2f}, {self.y:.2f})"
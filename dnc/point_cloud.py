@@ -0,0 +1,60 @@
+import numpy as np
+
+# a view holding at most this many points draws them one by one; denser
+# views are binned into a count raster at about screen resolution
+SCATTER_LIMIT = 20000
+
+
+class PointCloud:
+    # coordinates kept sorted by x, so the points inside a view window are a
+    # contiguous x slab found with two binary searches, filtered on y. the
+    # cost of a view depends on how many points it holds, not on n
+    def __init__(self, xs, ys):
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        order = np.argsort(xs, kind='stable')
+        self.xs = xs[order]
+        self.ys = ys[order]
+        if len(self.xs):
+            self.bounds = (self.xs[0], self.xs[-1], float(self.ys.min()), float(self.ys.max()))
+        else:
+            self.bounds = (0.0, 1.0, 0.0, 1.0)
+
+    @classmethod
+    def from_points(cls, points):
+        n = len(points)
+        return cls(np.fromiter((p.x for p in points), np.float64, n),
+                   np.fromiter((p.y for p in points), np.float64, n))
+
+    def __len__(self):
+        return len(self.xs)
+
+    def visible(self, x0, x1, y0, y1):
+        lo = np.searchsorted(self.xs, x0, 'left')
+        hi = np.searchsorted(self.xs, x1, 'right')
+        xs = self.xs[lo:hi]
+        ys = self.ys[lo:hi]
+        inside = (ys >= y0) & (ys <= y1)
+        return xs[inside], ys[inside]
+
+    def density(self, xs, ys, x0, x1, y0, y1, width, height):
+        # counts per cell, row 0 at y0 (for imshow with origin='lower').
+        # one bincount over flattened cell numbers, no python loop
+        width = max(1, width)
+        height = max(1, height)
+        cx = ((xs - x0) * (width / max(x1 - x0, 1e-300))).astype(np.intp)
+        cy = ((ys - y0) * (height / max(y1 - y0, 1e-300))).astype(np.intp)
+        np.clip(cx, 0, width - 1, out=cx)
+        np.clip(cy, 0, height - 1, out=cy)
+        counts = np.bincount(cy * width + cx, minlength=width * height)
+        return counts.reshape(height, width)
+
+    def view(self, x0, x1, y0, y1, width, height, limit=SCATTER_LIMIT):
+        # ('points', xs, ys) when the window is sparse enough to draw every
+        # point, else ('density', counts, None)
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        xs, ys = self.visible(x0, x1, y0, y1)
+        if len(xs) <= limit:
+            return 'points', xs, ys
+        return 'density', self.density(xs, ys, x0, x1, y0, y1, width, height), None
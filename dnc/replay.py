@@ -0,0 +1,91 @@
+from dnc.step_log import (CP_START, CP_DIVIDE, CP_BRUTE, CP_MERGE, CP_STRIP, CP_INDEX_ANSWER)
+
+# a snapshot of the replay state is kept every CHECKPOINT_EVERY steps, so
+# seeking anywhere replays at most that many records
+CHECKPOINT_EVERY = 256
+SCAN_BLOCK = 4096
+
+
+class ReplayState:
+    # what the closest pair picture looks like right after one step: the
+    # mid line of every divide still open (by depth), the x rank range being
+    # worked on, the strip being checked and the smallest distance so far
+    __slots__ = ('step', 'mids', 'active', 'strip', 'best', 'kind')
+
+    def __init__(self):
+        self.step = -1
+        self.mids = []
+        self.active = None
+        self.strip = None
+        self.best = float('inf')
+        self.kind = None
+
+    def copy(self):
+        state = ReplayState()
+        state.step = self.step
+        state.mids = list(self.mids)
+        state.active = self.active
+        state.strip = self.strip
+        state.best = self.best
+        state.kind = self.kind
+        return state
+
+    def apply(self, step, record):
+        kind, depth, lo, hi, mid_rank, count, value = record
+        self.step = step
+        self.kind = kind
+        self.strip = None
+        if kind == CP_START:
+            self.mids = []
+            self.active = (lo, hi)
+            self.best = float('inf')
+        elif kind == CP_DIVIDE:
+            # records carry their depth, so the open divides are rebuilt
+            # from it even when deeper levels were not recorded
+            del self.mids[depth:]
+            self.mids.append(mid_rank)
+            self.active = (lo, hi)
+        elif kind == CP_BRUTE:
+            self.active = (lo, hi)
+        elif kind == CP_MERGE:
+            del self.mids[depth + 1:]
+            self.best = min(self.best, value)
+        elif kind == CP_STRIP:
+            del self.mids[depth + 1:]
+            self.active = (lo, hi)
+            self.strip = (mid_rank, value, count)
+        elif kind == CP_INDEX_ANSWER:
+            self.best = value
+
+
+class ClosestPairReplay:
+    # one pass over a step log builds the checkpoints; after that seek(i)
+    # costs at most `every` record applications whatever the log length.
+    # playing forward in small strides continues from the current state
+    def __init__(self, log, every=CHECKPOINT_EVERY):
+        self.log = log
+        self.every = every
+        self.first = log.first
+        self.total = len(log)
+        self.checkpoints = []
+        state = ReplayState()
+        state.step = self.first - 1
+        for lo in range(self.first, self.total, SCAN_BLOCK):
+            for i, record in enumerate(log.records(lo, lo + SCAN_BLOCK), lo):
+                if (i - self.first) % every == 0:
+                    self.checkpoints.append(state.copy())
+                state.apply(i, record)
+        self.state = self.checkpoints[0].copy() if self.checkpoints else state
+
+    def __len__(self):
+        return self.total - self.first
+
+    def seek(self, i):
+        i = max(self.first, min(i, self.total - 1))
+        state = self.state
+        if not state.step <= i < state.step + self.every:
+            state = self.checkpoints[(i - self.first) // self.every].copy()
+        for j, record in enumerate(self.log.records(state.step + 1, i + 1), state.step + 1):
+            state.apply(j, record)
+        self.state = state
+        return state
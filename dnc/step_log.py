@@ -0,0 +1,270 @@
+import math
+import os
+import struct
+import tempfile
+from bisect import bisect_right
+
+from dnc.decimal_io import digit_count, int_to_str
+from dnc.trace import Tracer
+
+# one fixed-size record per algorithm step: kind, recursion depth, four
+# integer fields and one float. what the fields mean depends on the kind;
+# points are referred to by rank in x order and karatsuba operands by their
+# path from the root, so no record holds a reference to the input
+RECORD = struct.Struct('<BHqqqqd')
+DEFAULT_CAPACITY = 1 << 16
+
+
+class StepLog:
+    # the newest `capacity` records live in a ring buffer in memory. with
+    # spill=True every full ring is appended to a temporary file first, so
+    # nothing is lost and memory stays at capacity records; without it the
+    # oldest records are overwritten and `first` moves forward
+    def __init__(self, capacity=DEFAULT_CAPACITY, spill=False, tmpdir=None):
+        self.capacity = capacity
+        self.ring = bytearray(capacity * RECORD.size)
+        self.total = 0
+        self.first = 0
+        self.spilled = 0
+        self.spill_file = None
+        if spill:
+            # unlinked on close, and by the os if the process dies first
+            self.spill_file = tempfile.TemporaryFile(suffix='.steps', dir=tmpdir)
+
+    def __len__(self):
+        return self.total
+
+    def append(self, record):
+        slot = self.total % self.capacity
+        if slot == 0 and self.total > 0 and self.spill_file is not None:
+            # spill the full ring before it is overwritten
+            self.spill_file.seek(0, os.SEEK_END)
+            self.spill_file.write(self.ring)
+            self.spilled = self.total
+        RECORD.pack_into(self.ring, slot * RECORD.size, *record)
+        self.total += 1
+        if self.spill_file is None:
+            self.first = max(0, self.total - self.capacity)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.total
+        if not self.first <= i < self.total:
+            raise IndexError(f"step {i} is not in the log")
+        if i < self.spilled:
+            self.spill_file.seek(i * RECORD.size)
+            return RECORD.unpack(self.spill_file.read(RECORD.size))
+        return RECORD.unpack_from(self.ring, (i % self.capacity) * RECORD.size)
+
+    def records(self, lo, hi):
+        return [self[i] for i in range(max(lo, self.first), min(hi, self.total))]
+
+    def close(self):
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+
+
+# ---- closest pair ----
+
+CP_START = 0
+CP_DIVIDE = 1
+CP_BRUTE = 2
+CP_MERGE = 3
+CP_STRIP = 4
+CP_INDEX_READY = 5
+CP_INDEX_ANSWER = 6
+
+
+class ClosestPairSteps(Tracer):
+    # turns closest pair events into records and hands each one to emit().
+    # every point list the algorithm divides is a contiguous run of the
+    # x-sorted input, stored as its [lo, hi) rank range. the y-list a node
+    # scans for its strip holds the points with x in (a, b], a and b being
+    # ancestor split values (it can be one point wider than the x run), so
+    # strip records store the rank range of that x interval instead
+    def __init__(self, points, max_depth=None, emit=None):
+        self.points = points
+        self.order = sorted(range(len(points)), key=lambda i: points[i].x)
+        self.xs = [points[i].x for i in self.order]
+        self.rank = {id(points[i]): r for r, i in enumerate(self.order)}
+        self.max_depth = max_depth
+        self.emit = emit
+        # open divides: [mid_rank, a, b, children seen]
+        self.open = []
+        self.node = None
+        self.skipped = 0
+
+    def _child_bounds(self):
+        if not self.open:
+            return -math.inf, math.inf
+        mid_rank, a, b, seen = self.open[-1]
+        mid_x = self.xs[mid_rank]
+        return (a, mid_x) if seen == 0 else (mid_x, b)
+
+    def _child_done(self):
+        if self.open:
+            self.open[-1][3] += 1
+
+    def _record(self, kind, depth, lo=0, hi=0, mid_rank=0, count=0, value=0.0):
+        if self.max_depth is not None and depth > self.max_depth:
+            self.skipped += 1
+            return
+        self.emit((kind, depth, lo, hi, mid_rank, count, value))
+
+    def start(self, points):
+        self._record(CP_START, 0, hi=len(points))
+
+    def divide(self, points_x, mid_point):
+        depth = len(self.open)
+        lo = self.rank[id(points_x[0])]
+        mid_rank = self.rank[id(mid_point)]
+        a, b = self._child_bounds()
+        self.open.append([mid_rank, a, b, 0])
+        self._record(CP_DIVIDE, depth, lo, lo + len(points_x), mid_rank, value=mid_point.x)
+
+    def brute_force(self, points):
+        lo = self.rank[id(points[0])] if points else 0
+        self._child_done()
+        self._record(CP_BRUTE, len(self.open), lo, lo + len(points))
+
+    def merge(self, min_dist):
+        # merges come in post-order, so the innermost open divide is the
+        # node being merged; its strip event follows right after
+        self.node = self.open.pop()
+        self._child_done()
+        self._record(CP_MERGE, len(self.open), mid_rank=self.node[0], value=min_dist)
+
+    def strip(self, strip, min_dist):
+        mid_rank, a, b, _ = self.node
+        self._record(CP_STRIP, len(self.open), bisect_right(self.xs, a), bisect_right(self.xs, b),
+                     mid_rank, len(strip), min_dist)
+
+    def index_ready(self, count):
+        self._record(CP_INDEX_READY, 0, hi=count)
+
+    def index_answer(self, min_dist):
+        self._record(CP_INDEX_ANSWER, 0, value=min_dist)
+
+    def render(self, record):
+        kind, depth, lo, hi, mid_rank, count, value = record
+        if kind == CP_START:
+            return f'starting with {hi} points'
+        if kind == CP_DIVIDE:
+            return f"dividing {hi - lo} points at x={value:.2f}"
+        if kind == CP_BRUTE:
+            return f"brute force checking {hi - lo} points"
+        if kind == CP_MERGE:
+            return f'merging: current min = {value:.4f}'
+        if kind == CP_STRIP:
+            return f'checking strip with {count} points'
+        if kind == CP_INDEX_READY:
+            return f'k-d tree index ready ({hi} points)'
+        return f'closest pair answered from index: {value:.4f}'
+
+    def points_in(self, lo, hi):
+        return [self.points[i] for i in self.order[lo:hi]]
+
+    def strip_points(self, record):
+        kind, depth, lo, hi, mid_rank, count, value = record
+        mid_x = self.xs[mid_rank]
+        return [p for p in self.points_in(lo, hi) if abs(p.x - mid_x) < value]
+
+
+# ---- karatsuba ----
+
+KA_BASE = 0
+KA_SPLIT = 1
+KA_COMBINE = 2
+
+
+class KaratsubaSteps(Tracer):
+    # every call in the karatsuba recursion is identified by its path from
+    # the root: one base-3 digit per level for z0, z1 or z2. the events
+    # arrive in a fixed pre/post order, so the path is tracked with a stack
+    # of child counters and the operands are rebuilt from it on demand
+    def __init__(self, x, y, max_depth=None, emit=None):
+        self.x = x
+        self.y = y
+        self.max_depth = max_depth
+        self.emit = emit
+        self.open = []
+        self.skipped = 0
+
+    def _child_path(self):
+        if not self.open:
+            return 0
+        path, seen = self.open[-1]
+        return path * 3 + seen
+
+    def _record(self, kind, depth, path):
+        if self.max_depth is not None and depth > self.max_depth:
+            self.skipped += 1
+            return
+        self.emit((kind, depth, path, 0, 0, 0, 0.0))
+
+    def karatsuba_base(self, x, y, result, depth):
+        path = self._child_path()
+        if self.open:
+            self.open[-1][1] += 1
+        self._record(KA_BASE, depth, path)
+
+    def karatsuba_split(self, x, y, half, depth):
+        path = self._child_path()
+        self.open.append([path, 0])
+        self._record(KA_SPLIT, depth, path)
+
+    def karatsuba_combine(self, x, y, result, depth):
+        path = self.open.pop()[0]
+        if self.open:
+            self.open[-1][1] += 1
+        self._record(KA_COMBINE, depth, path)
+
+    def operands(self, depth, path):
+        x, y = self.x, self.y
+        digits = [(path // 3**k) % 3 for k in range(depth - 1, -1, -1)]
+        for child in digits:
+            half = max(digit_count(x), digit_count(y)) // 2
+            power = 10 ** half
+            high1, low1 = divmod(x, power)
+            high2, low2 = divmod(y, power)
+            if child == 0:
+                x, y = low1, low2
+            elif child == 1:
+                x, y = low1 + high1, low2 + high2
+            else:
+                x, y = high1, high2
+        return x, y
+
+    def render(self, record):
+        kind, depth, path = record[:3]
+        x, y = self.operands(depth, path)
+        pad = '  ' * depth
+        if kind == KA_BASE:
+            return f"{pad}base case: {int_to_str(x)} x {int_to_str(y)} = {int_to_str(x * y)}"
+        if kind == KA_COMBINE:
+            return f"{pad}combine: result = {int_to_str(x * y)}"
+        half = max(digit_count(x), digit_count(y)) // 2
+        high1, low1 = divmod(x, 10 ** half)
+        return f"{pad}split: {int_to_str(x)} = {int_to_str(high1)}*10^{half} + {int_to_str(low1)}"
+
+
+def sampling_depth(branching, steps, max_steps):
+    # deepest level to keep so that about max_steps records remain (each
+    # node reports two steps), or None when the full run already fits
+    if steps <= max_steps:
+        return None
+    depth = 0
+    while 2 * branching ** (depth + 2) <= max_steps:
+        depth += 1
+    return depth
+
+
+def estimate_closest_pair_steps(n):
+    # divide, merge and strip per internal node plus one brute force leaf
+    return 4 * max(1, n)
+
+
+def estimate_karatsuba_steps(digits):
+    levels = max(0, math.ceil(math.log2(max(1, digits))))
+    return 2 * 3 ** levels
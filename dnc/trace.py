@@ -0,0 +1,100 @@
+# structured events from the divide-and-conquer algorithms. the algorithms
+# call these hooks only when a tracer is attached, and they hand over the
+# objects they already have; nothing is formatted unless a tracer asks for it
+
+from dnc.decimal_io import int_to_str
+
+
+class Tracer:
+    # every hook is a no-op, so a subclass overrides just the events it needs
+
+    # ---- closest pair ----
+
+    def start(self, points):
+        pass
+
+    def divide(self, points_x, mid_point):
+        pass
+
+    def brute_force(self, points):
+        pass
+
+    def merge(self, min_dist):
+        pass
+
+    def strip(self, strip, min_dist):
+        pass
+
+    def measure(self, distance):
+        # the distance function a brute force or strip scan should call;
+        # override to wrap it, e.g. to count evaluations
+        return distance
+
+    def index_ready(self, count):
+        pass
+
+    def index_answer(self, min_dist):
+        pass
+
+    # ---- karatsuba ----
+
+    def karatsuba_base(self, x, y, result, depth):
+        pass
+
+    def karatsuba_split(self, x, y, half, depth):
+        pass
+
+    def karatsuba_combine(self, x, y, result, depth):
+        pass
+
+
+class MessageTracer(Tracer):
+    # renders each event as the one-line message the gui used to print and
+    # passes it to write(). karatsuba messages include whole operands, so
+    # this is only meant for small inputs
+    def __init__(self, write=print):
+        self.write = write
+
+    def start(self, points):
+        self.write(f'starting with {len(points)} points')
+
+    def divide(self, points_x, mid_point):
+        self.write(f"dividing {len(points_x)} points at x={mid_point.x:.2f}")
+
+    def brute_force(self, points):
+        self.write(f"brute force checking {len(points)} points")
+
+    def merge(self, min_dist):
+        self.write(f'merging: current min = {min_dist:.4f}')
+
+    def strip(self, strip, min_dist):
+        self.write(f'checking strip with {len(strip)} points')
+
+    def index_ready(self, count):
+        self.write(f'k-d tree index ready ({count} points)')
+
+    def index_answer(self, min_dist):
+        self.write(f'closest pair answered from index: {min_dist:.4f}')
+
+    def karatsuba_base(self, x, y, result, depth):
+        self.write(f"{'  '*depth}base case: {int_to_str(x)} x {int_to_str(y)} = {int_to_str(result)}")
+
+    def karatsuba_split(self, x, y, half, depth):
+        high1, low1 = divmod(x, 10 ** half)
+        self.write(f"{'  '*depth}split: {int_to_str(x)} = {int_to_str(high1)}*10^{half} + {int_to_str(low1)}")
+
+    def karatsuba_combine(self, x, y, result, depth):
+        self.write(f"{'  '*depth}combine: result = {int_to_str(result)}")
+
+
+class DistanceCounter(Tracer):
+    # counts distance evaluations of one run through its own wrapper, so
+    # concurrent runs each keep their own count
+    def __init__(self):
+        self.evals = 0
+
+    def measure(self, distance):
+        def counted(p1, p2):
+            self.evals += 1
+            return distance(p1, p2)
+        return counted
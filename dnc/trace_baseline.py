@@ -0,0 +1,100 @@
+import math
+
+# the closest pair and karatsuba code exactly as Q3 had it before the
+# algorithms moved into dnc.closest_pair / dnc.multiply with tracer hooks.
+# kept only as the reference for Q3's --trace-overhead benchmark
+
+
+def distance(p1, p2):
+    return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
+
+
+def brute_force_closest(points):
+    min_dist = float('inf')
+    pair = None
+    n = len(points)
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            dist = distance(points[i], points[j])
+            if dist < min_dist:
+                min_dist = dist
+                pair = (points[i], points[j])
+
+    return min_dist, pair
+
+
+def strip_closest(strip, d):
+    min_dist = d
+    pair = None
+    strip.sort(key=lambda p: p.y)
+
+    for i in range(len(strip)):
+        j = i + 1
+        while j < len(strip) and (strip[j].y - strip[i].y) < min_dist:
+            dist = distance(strip[i], strip[j])
+            if dist < min_dist:
+                min_dist = dist
+                pair = (strip[i], strip[j])
+            j += 1
+
+    return min_dist, pair
+
+
+def closest_pair_recursive(points_x, points_y):
+    n = len(points_x)
+
+    if n <= 3:
+        return brute_force_closest(points_x)
+
+    mid = n // 2
+    mid_point = points_x[mid]
+
+    points_y_left = [p for p in points_y if p.x <= mid_point.x]
+    points_y_right = [p for p in points_y if p.x > mid_point.x]
+
+    left_dist, left_pair = closest_pair_recursive(points_x[:mid], points_y_left)
+    right_dist, right_pair = closest_pair_recursive(points_x[mid:], points_y_right)
+
+    if left_dist < right_dist:
+        min_dist = left_dist
+        min_pair = left_pair
+    else:
+        min_dist = right_dist
+        min_pair = right_pair
+
+    strip = [p for p in points_y if abs(p.x - mid_point.x) < min_dist]
+
+    if strip:
+        strip_dist, strip_pair = strip_closest(strip, min_dist)
+        if strip_dist < min_dist:
+            min_dist = strip_dist
+            min_pair = strip_pair
+
+    return min_dist, min_pair
+
+
+def closest_pair(points):
+    points_x = sorted(points, key=lambda p: p.x)
+    points_y = sorted(points, key=lambda p: p.y)
+    return closest_pair_recursive(points_x, points_y)
+
+
+def karatsuba_multiply(x, y):
+    if x < 10 or y < 10:
+        return x * y
+
+    n = max(len(str(x)), len(str(y)))
+    half = n // 2
+    power = 10 ** half
+
+    high1 = x // power
+    low1 = x % power
+    high2 = y // power
+    low2 = y % power
+
+    z0 = karatsuba_multiply(low1, low2)
+    z1 = karatsuba_multiply(low1 + high1, low2 + high2)
+    z2 = karatsuba_multiply(high1, high2)
+
+    return z2 * (10 ** (2 * half)) + (z1 - z2 - z0) * power + z0